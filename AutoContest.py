@@ -7,25 +7,48 @@ by Adam Rivers — A product of Hello Security LLC Research Labs
 """
 
 import os
+import re
+import sys
 import json
+import time
+import zlib
+import heapq
+import random
+import socket
+import codecs
+import hashlib
+import sqlite3
+import queue
+import signal
+import argparse
+import multiprocessing
 import logging
 import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.prompt import Prompt
-from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# aiohttp, bs4, the optional parsers and the interactive parts of rich are
+# imported where they are first used, so `--help` and `results` start fast.
 
 # ========== Init ==========
 console = Console()
 
 CONFIG_FILE = "config.json"
-RESULT_FILE = "contest-results.json"
+LEDGER_FILE = "contest-ledger.db"
+JOURNAL_FILE = "run-journal.ndjson"
+HTTP_CACHE_DIR = "http-cache"
+AGGREGATOR_INDEX_FILE = "aggregator-index.json"
+FORM_PLAN_FILE = "form-plans.json"
+REDIRECT_CACHE_FILE = "redirect-cache.json"
+NO_FORM_CACHE_FILE = "no-form-cache.json"
+CIRCUIT_FILE = "circuit-breakers.json"
+RUN_REPORT_FILE = "run-report.json"
+METRICS_FILE = "metrics.prom"
 
 # ========== Config ==========
 def load_config():
@@ -127,6 +150,43 @@ def load_config():
                 "phone": "1234567890"
             },
             "max_retries": 3,
+            "retry_base_delay": 1.0,
+            "retry_max_delay": 60.0,
+            "breaker_threshold": 5,
+            "breaker_cooldown_minutes": 30,
+            "hub_sites": list(DEFAULT_HUB_SITES),
+            "aggregator_recheck_days": 7,
+            "scrape_concurrency": 20,
+            "per_host_concurrency": 2,
+            "tracking_params": list(DEFAULT_TRACKING_PARAMS),
+            "resolve_redirects": True,
+            "redirect_cache_days": 30,
+            "redirect_patterns": list(DEFAULT_REDIRECT_PATTERNS),
+            "submit_concurrency": 10,
+            "min_host_interval": 1.0,
+            "queue_size": 1000,
+            "workers": 1,
+            "reentry_window_hours": 24,
+            "ledger_batch_size": 100,
+            "no_form_cache_days": 7,
+            "no_form_pattern_threshold": 5,
+            "form_scan_kb": 256,
+            "max_body_kb": 2048,
+            "success_scan_kb": 64,
+            "journal_batch_size": 50,
+            "max_connections": 100,
+            "per_host_connections": 4,
+            "dns_cache_ttl": 300,
+            "keepalive_timeout": 30,
+            "connect_timeout": 5,
+            "read_timeout": 10,
+            "request_timeout": 20,
+            "host_overrides": {},
+            "http_cache": True,
+            "http_cache_max_age": 3600,
+            "http_cache_max_mb": 50,
+            "html_parser": "auto",
+            "daemon_interval_minutes": 360,
             "twocaptcha_api_key": ""
         }
 
@@ -150,6 +210,7 @@ def get_user_data(config):
     }
 
 def input_user_data():
+    from rich.prompt import Prompt
     console.print(Panel.fit("[bold cyan]Enter Your Details[/]", border_style="cyan"))
     user_data = {}
     user_data["first_name"] = Prompt.ask("First Name", default="John")
@@ -162,216 +223,2051 @@ def input_user_data():
     user_data["phone"] = Prompt.ask("Phone Number", default="1234567890")
     return user_data
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line so the log can be filtered with jq or shipped as-is."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "event": getattr(record, "event", None) or record.getMessage()
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
 def init_logging():
-    logging.basicConfig(
-        filename="automation.log",
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s"
-    )
+    handler = logging.FileHandler("automation.log")
+    handler.setFormatter(JsonFormatter())
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
 
-def update_aggregator_urls(config):
-    console.print(Panel.fit("[bold cyan]Automatically Updating Aggregator URLs[/]", border_style="cyan"))
-    
-    # Curated list of hub sites that list sweepstakes aggregators (no API needed)
-    hub_sites = [
-        "https://www.liveabout.com/best-sweepstakes-websites-4163145",
-        "https://www.thebalanceeveryday.com/top-sweepstakes-directories-896784",
-        "https://www.sweepstakeslovers.com/resources/",
-        "https://www.contestgirl.com/links/"
-    ]
-    
-    new_aggregators = []
-    with Progress(
+def log_event(level, event, **fields):
+    """Log a named event with structured fields, e.g. ``log_event(logging.WARNING, "scrape_failed", url=u)``."""
+    logging.log(level, event, extra={"event": event, "fields": fields})
+
+def make_progress():
+    from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn
+    return Progress(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
         TaskProgressColumn(),
         console=console
-    ) as progress:
+    )
+
+# ========== Metrics ==========
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def new_histogram():
+    # Plain dict so snapshots pickle across worker processes and dump to JSON
+    return {"counts": [0] * (len(LATENCY_BUCKETS) + 1), "sum": 0.0, "count": 0}
+
+def observe_histogram(hist, seconds):
+    index = len(LATENCY_BUCKETS)
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            index = i
+            break
+    hist["counts"][index] += 1
+    hist["sum"] += seconds
+    hist["count"] += 1
+
+def merge_histogram(into, hist):
+    into["counts"] = [a + b for a, b in zip(into["counts"], hist["counts"])]
+    into["sum"] += hist["sum"]
+    into["count"] += hist["count"]
+
+def histogram_quantile(hist, q):
+    """Upper bucket bound holding quantile ``q``, or None for an empty histogram."""
+    if not hist["count"]:
+        return None
+    rank, seen = q * hist["count"], 0
+    for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), hist["counts"]):
+        seen += count
+        if seen >= rank:
+            return bound
+    return float("inf")
+
+def _prom_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class PhaseTimer:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.monotonic() - self.started
+        self.metrics.phases[self.name] = self.metrics.phases.get(self.name, 0.0) + elapsed
+        log_event(logging.INFO, "phase_finished", phase=self.name, seconds=round(elapsed, 3))
+
+class RunMetrics:
+    """Counters, gauges and latency histograms collected over one run.
+
+    Request latencies are kept per host and per stage (``dns``, ``connect``,
+    ``ttfb`` and ``total``), so a slow run can be pinned on a single site or
+    on a single part of the request. Everything is plain data: worker
+    processes send ``snapshot()`` back to the parent, which ``merge()``s it.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.time()
+        self.phases = {}
+        self.latency = defaultdict(dict)  # host -> stage -> histogram
+        self.parse = {}                   # kind -> histogram
+        self.bytes = defaultdict(int)     # host -> body bytes received
+        self.counters = defaultdict(int)
+        self.gauges = {}                  # name -> {"value": n, "max": n}
+
+    def phase(self, name):
+        """Context manager adding the wall time of the block to phase ``name``."""
+        return PhaseTimer(self, name)
+
+    def observe(self, host, stage, seconds):
+        hist = self.latency[host].get(stage)
+        if hist is None:
+            hist = self.latency[host][stage] = new_histogram()
+        observe_histogram(hist, seconds)
+
+    def observe_parse(self, kind, seconds):
+        if kind not in self.parse:
+            self.parse[kind] = new_histogram()
+        observe_histogram(self.parse[kind], seconds)
+
+    def add_bytes(self, host, count):
+        self.bytes[host] += count
+
+    def incr(self, name, amount=1):
+        self.counters[name] += amount
+
+    def gauge(self, name, value):
+        current = self.gauges.get(name)
+        if current is None:
+            self.gauges[name] = {"value": value, "max": value}
+        else:
+            current["value"] = value
+            current["max"] = max(current["max"], value)
+
+    def snapshot(self):
+        return {
+            "phases": dict(self.phases),
+            "latency": {host: dict(stages) for host, stages in self.latency.items()},
+            "parse": dict(self.parse),
+            "bytes": dict(self.bytes),
+            "counters": dict(self.counters),
+            "gauges": {name: dict(g) for name, g in self.gauges.items()}
+        }
+
+    def merge(self, snapshot):
+        """Fold in a worker's ``snapshot()``; phases are timed by the parent and are not merged."""
+        for host, stages in snapshot["latency"].items():
+            for stage, hist in stages.items():
+                if stage in self.latency[host]:
+                    merge_histogram(self.latency[host][stage], hist)
+                else:
+                    self.latency[host][stage] = dict(hist)
+        for kind, hist in snapshot["parse"].items():
+            if kind in self.parse:
+                merge_histogram(self.parse[kind], hist)
+            else:
+                self.parse[kind] = dict(hist)
+        for host, count in snapshot["bytes"].items():
+            self.bytes[host] += count
+        for name, count in snapshot["counters"].items():
+            self.counters[name] += count
+        for name, g in snapshot["gauges"].items():
+            current = self.gauges.setdefault(name, {"value": 0, "max": 0})
+            current["value"] += g["value"]
+            current["max"] = max(current["max"], g["max"])
+
+    def report(self):
+        """JSON-ready run report: the raw snapshot plus per-host quantile summaries."""
+        hosts = {}
+        for host, stages in self.latency.items():
+            hosts[host] = {
+                stage: {
+                    "count": hist["count"],
+                    "mean": round(hist["sum"] / hist["count"], 4) if hist["count"] else None,
+                    "p50": histogram_quantile(hist, 0.5),
+                    "p99": histogram_quantile(hist, 0.99)
+                }
+                for stage, hist in stages.items()
+            }
+            hosts[host]["bytes"] = self.bytes.get(host, 0)
+        report = self.snapshot()
+        report["started"] = datetime.fromtimestamp(self.started, timezone.utc).isoformat()
+        report["buckets"] = list(LATENCY_BUCKETS)
+        report["hosts"] = hosts
+        return report
+
+    def prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = ["# TYPE autocontest_phase_seconds gauge"]
+        for name, seconds in self.phases.items():
+            lines.append(f'autocontest_phase_seconds{{phase="{_prom_label(name)}"}} {seconds:.6f}')
+
+        def histogram(metric, series):
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, hist in series:
+                label = ",".join(f'{k}="{_prom_label(v)}"' for k, v in labels)
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, hist["counts"]):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {hist["count"]}')
+                lines.append(f"{metric}_sum{{{label}}} {hist['sum']:.6f}")
+                lines.append(f"{metric}_count{{{label}}} {hist['count']}")
+
+        histogram("autocontest_request_seconds", [
+            ((("host", host), ("stage", stage)), hist)
+            for host, stages in self.latency.items() for stage, hist in stages.items()
+        ])
+        histogram("autocontest_parse_seconds", [((("kind", kind),), hist) for kind, hist in self.parse.items()])
+        lines.append("# TYPE autocontest_received_bytes_total counter")
+        for host, count in self.bytes.items():
+            lines.append(f'autocontest_received_bytes_total{{host="{_prom_label(host)}"}} {count}')
+        for name, count in sorted(self.counters.items()):
+            lines.append(f"# TYPE autocontest_{name}_total counter")
+            lines.append(f"autocontest_{name}_total {count}")
+        for name, g in sorted(self.gauges.items()):
+            lines.append(f"# TYPE autocontest_{name} gauge")
+            lines.append(f"autocontest_{name} {g['value']}")
+            lines.append(f"# TYPE autocontest_{name}_max gauge")
+            lines.append(f"autocontest_{name}_max {g['max']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, report_path, prometheus_path):
+        for path, text in ((report_path, json.dumps(self.report(), indent=2)), (prometheus_path, self.prometheus())):
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                f.write(text)
+            os.replace(tmp, path)
+
+class TimedRequest:
+    """Wraps an aiohttp request context manager to record the request's total time for its host."""
+
+    def __init__(self, request, host):
+        self.request = request
+        self.host = host
+
+    async def __aenter__(self):
+        self.started = time.monotonic()
+        return await self.request.__aenter__()
+
+    async def __aexit__(self, *exc_info):
+        try:
+            return await self.request.__aexit__(*exc_info)
+        finally:
+            metrics.observe(self.host, "total", time.monotonic() - self.started)
+
+metrics = RunMetrics()
+
+# ========== Parsing ==========
+# Optional faster HTML parsers, preferred in this order when installed
+HTML_BACKENDS = ("selectolax", "lxml", "html.parser")
+html_backend = None  # chosen on first use unless configure_html_backend() is called
+HTMLParser = None
+lxml = None
+
+def load_html_backend(name):
+    """Import the library behind backend ``name``; return False if it is not installed."""
+    global HTMLParser, lxml
+    try:
+        if name == "selectolax" and HTMLParser is None:
+            try:
+                from selectolax.lexbor import LexborHTMLParser as HTMLParser
+            except ImportError:
+                from selectolax.parser import HTMLParser
+        elif name == "lxml" and lxml is None:
+            import lxml.html
+    except ImportError:
+        return False
+    return True
+
+def configure_html_backend(name="auto"):
+    """Select the HTML parser used by the extract_* helpers."""
+    global html_backend
+    if name == "auto":
+        html_backend = next(backend for backend in HTML_BACKENDS if load_html_backend(backend))
+    elif name in HTML_BACKENDS and load_html_backend(name):
+        html_backend = name
+    else:
+        log_event(logging.WARNING, "html_parser_unavailable", parser=name)
+        html_backend = "html.parser"
+    return html_backend
+
+def _selectolax_attr(node, key):
+    # selectolax reports valueless attributes as None; BeautifulSoup uses ""
+    if key not in node.attributes:
+        return None
+    return node.attributes[key] or ""
+
+def _hrefs_selectolax(html):
+    return [a.attributes["href"] for a in HTMLParser(html).css("a[href]") if a.attributes.get("href")]
+
+def _hrefs_lxml(html):
+    return [a.get("href") for a in lxml.html.fromstring(html).iter("a") if a.get("href")]
+
+def _hrefs_soup(html):
+    from bs4 import BeautifulSoup, SoupStrainer
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("a", href=True))
+    return [a["href"] for a in soup.find_all("a", href=True) if a.get("href")]
+
+def _form_selectolax(html):
+    tree = HTMLParser(html)
+    form = tree.css_first("form")
+    if form is None:
+        return None
+    fields = []
+    for node in form.css("input, select, textarea"):
+        field = {"tag": node.tag, "name": _selectolax_attr(node, "name"),
+                 "type": None, "value": _selectolax_attr(node, "value"), "options": []}
+        if node.tag == "input":
+            field["type"] = (_selectolax_attr(node, "type") or "text").lower()
+        elif node.tag == "select":
+            field["options"] = [o for o in (_selectolax_attr(opt, "value") for opt in node.css("option")) if o]
+        fields.append(field)
+    if not fields:
+        # lexbor moves a <form> that sits directly in a <table> out of it,
+        # leaving its fields behind; let a tree-preserving backend try
+        raise ValueError("form has no fields")
+    recaptcha = tree.css_first("div.g-recaptcha")
+    hcaptcha = tree.css_first("div.h-captcha")
+    method = _selectolax_attr(form, "method")
+    return {
+        "action": _selectolax_attr(form, "action"),
+        "method": "post" if method is None else method.lower(),
+        "fields": fields,
+        "recaptcha_sitekey": None if recaptcha is None else _selectolax_attr(recaptcha, "data-sitekey") or "",
+        "hcaptcha_sitekey": None if hcaptcha is None else _selectolax_attr(hcaptcha, "data-sitekey") or ""
+    }
+
+def _form_lxml(html):
+    doc = lxml.html.fromstring(html)
+    form = next(doc.iter("form"), None)
+    if form is None:
+        return None
+    fields = []
+    for node in form.iter("input", "select", "textarea"):
+        field = {"tag": node.tag, "name": node.get("name"), "type": None,
+                 "value": node.get("value"), "options": []}
+        if node.tag == "input":
+            field["type"] = node.get("type", "text").lower()
+        elif node.tag == "select":
+            field["options"] = [opt.get("value") for opt in node.iter("option") if opt.get("value")]
+        fields.append(field)
+
+    def sitekey(css_class):
+        divs = doc.xpath(f"//div[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]")
+        return None if not divs else divs[0].get("data-sitekey") or ""
+
+    return {
+        "action": form.get("action"),
+        "method": form.get("method", "post").lower(),
+        "fields": fields,
+        "recaptcha_sitekey": sitekey("g-recaptcha"),
+        "hcaptcha_sitekey": sitekey("h-captcha")
+    }
+
+def _form_soup(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    form = soup.find("form")
+    if form is None:
+        return None
+    fields = []
+    for node in form.find_all(["input", "select", "textarea"]):
+        field = {"tag": node.name, "name": node.get("name"), "type": None,
+                 "value": node.get("value"), "options": []}
+        if node.name == "input":
+            field["type"] = node.get("type", "text").lower()
+        elif node.name == "select":
+            field["options"] = [opt["value"] for opt in node.find_all("option") if opt.get("value")]
+        fields.append(field)
+    recaptcha = soup.find("div", class_="g-recaptcha")
+    hcaptcha = soup.find("div", class_="h-captcha")
+    return {
+        "action": form.get("action"),
+        "method": form.get("method", "post").lower(),
+        "fields": fields,
+        "recaptcha_sitekey": None if recaptcha is None else recaptcha.get("data-sitekey") or "",
+        "hcaptcha_sitekey": None if hcaptcha is None else hcaptcha.get("data-sitekey") or ""
+    }
+
+_HREF_EXTRACTORS = {"selectolax": _hrefs_selectolax, "lxml": _hrefs_lxml, "html.parser": _hrefs_soup}
+_FORM_EXTRACTORS = {"selectolax": _form_selectolax, "lxml": _form_lxml, "html.parser": _form_soup}
+
+def _extract(extractors, html, kind):
+    if html_backend is None:
+        configure_html_backend()
+    started = time.monotonic()
+    try:
+        # A backend that fails on a page hands it to the next one, ending with html.parser
+        for backend in HTML_BACKENDS[HTML_BACKENDS.index(html_backend):-1]:
+            if not load_html_backend(backend):
+                continue
+            try:
+                return extractors[backend](html)
+            except Exception as e:
+                log_event(logging.DEBUG, "parse_fallback", backend=backend, error=str(e))
+        return extractors["html.parser"](html)
+    finally:
+        metrics.observe_parse(kind, time.monotonic() - started)
+
+def extract_hrefs(html):
+    """Return the non-empty ``href`` of every ``<a>`` in the page, unresolved."""
+    return _extract(_HREF_EXTRACTORS, html, "links")
+
+def extract_form(html):
+    """Describe the first ``<form>`` in the page, or return None if there is none.
+
+    The result holds the form's raw ``action``, its lowercased ``method``,
+    its ``input``/``select``/``textarea`` fields in document order, and the
+    reCAPTCHA/hCaptcha sitekeys ("" when a widget has no sitekey, None when
+    there is no widget).
+    """
+    return _extract(_FORM_EXTRACTORS, html, "form")
+
+# ========== HTTP Cache ==========
+class ResponseCache:
+    """Persistent, size-bounded cache of page bodies keyed by URL.
+
+    Bodies are stored zlib-compressed, one file per URL, alongside an index
+    holding each entry's validators (ETag / Last-Modified), when it was
+    stored and when it was last used. Once the stored bytes exceed
+    ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_age=3600, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(directory, "index.json")
+        os.makedirs(directory, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, "r") as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError) as e:
+                log_event(logging.WARNING, "cache_index_unreadable", error=str(e))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".z")
+
+    def get(self, url):
+        return self.index.get(url)
+
+    def is_fresh(self, entry):
+        return time.time() - entry["stored"] < self.max_age
+
+    def validators(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, url):
+        """Return the cached body for ``url`` or None if it is missing on disk."""
+        entry = self.index[url]
+        try:
+            with open(self._path(entry["key"]), "rb") as f:
+                body = zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error) as e:
+            log_event(logging.WARNING, "cache_entry_corrupt", url=url, error=str(e))
+            del self.index[url]
+            return None
+        entry["used"] = time.time()
+        return body
+
+    def refresh(self, url):
+        """Mark ``url`` as revalidated by a 304 response."""
+        self.index[url]["stored"] = time.time()
+
+    def store(self, url, body, headers):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        data = zlib.compress(body.encode("utf-8"))
+        with open(self._path(key), "wb") as f:
+            f.write(data)
+        now = time.time()
+        self.index[url] = {
+            "key": key,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored": now,
+            "used": now,
+            "size": len(data)
+        }
+        self._evict()
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1]["used"]):
+            try:
+                os.remove(self._path(entry["key"]))
+            except OSError:
+                pass
+            del self.index[url]
+            total -= entry["size"]
+            if total <= self.max_bytes:
+                break
+
+    def save(self):
+        with open(self.index_file, "w") as f:
+            json.dump(self.index, f)
+
+# ========== HTTP Client ==========
+CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+def sniff_charset(resp, head):
+    """Pick the response charset: Content-Type first, then a <meta> tag, then UTF-8."""
+    match = CHARSET_PATTERN.search(head)
+    for candidate in (resp.charset, match and match.group(1).decode("ascii")):
+        if candidate:
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                pass
+    return "utf-8"
+
+async def read_text(resp, max_bytes, require=None, require_within=None, stop_after=None):
+    """Stream and decode at most ``max_bytes`` of a response body.
+
+    The body is decoded incrementally as chunks arrive. When ``require``
+    (a lowercase byte marker) has not appeared within ``require_within``
+    bytes, None is returned without reading further. Reading also stops
+    once ``stop_after`` has been seen, since nothing past it is needed.
+    """
+    decoder = None
+    head = b""  # raw bytes held back until there is enough to sniff the charset
+    parts = []
+    received = 0
+    found = require is None
+    tail = b""
+    async for chunk in resp.content.iter_chunked(16384):
+        chunk = chunk[:max_bytes - received]
+        received += len(chunk)
+        if decoder is None:
+            head += chunk
+            if len(head) >= 2048:
+                decoder = codecs.getincrementaldecoder(sniff_charset(resp, head))(errors="replace")
+                parts.append(decoder.decode(head))
+        else:
+            parts.append(decoder.decode(chunk))
+        # Markers are matched on raw bytes, keeping a short tail for ones split across chunks
+        window = (tail + chunk).lower()
+        tail = window[-16:]
+        if not found:
+            if require in window:
+                found = True
+            elif received >= require_within:
+                break
+        if stop_after and found and stop_after in window:
+            break
+        if received >= max_bytes:
+            break
+    metrics.add_bytes(host_of(str(resp.url)), received)
+    if not found:
+        return None
+    if decoder is None:
+        decoder = codecs.getincrementaldecoder(sniff_charset(resp, head))(errors="replace")
+        parts.append(decoder.decode(head))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+class StaticResolver:
+    """Answer DNS lookups for pinned names from a table, like curl's ``--resolve``.
+
+    Keys are host names, or ``*.suffix`` to pin every name under a domain;
+    anything not in the table goes to aiohttp's default resolver.
+    """
+
+    def __init__(self, overrides):
+        import aiohttp
+        self.overrides = overrides
+        self.fallback = aiohttp.DefaultResolver()
+
+    def lookup(self, host):
+        if host in self.overrides:
+            return self.overrides[host]
+        for pattern, address in self.overrides.items():
+            if pattern.startswith("*.") and host.endswith(pattern[1:]):
+                return address
+        return None
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        address = self.lookup(host)
+        if address is None:
+            return await self.fallback.resolve(host, port, family)
+        return [{"hostname": host, "host": address, "port": port,
+                 "family": socket.AF_INET6 if ":" in address else socket.AF_INET,
+                 "proto": 0, "flags": socket.AI_NUMERICHOST}]
+
+    async def close(self):
+        await self.fallback.close()
+
+class HttpClient:
+    """Pooled aiohttp session that lives for a whole run.
+
+    Every fetch in the tool goes through one of these so that TCP/TLS
+    connections are kept alive and DNS answers are cached between requests.
+    """
+
+    def __init__(self, config, headers=None):
+        self.config = config
+        self.headers = headers or {"User-Agent": "Mozilla/5.0"}
+        self.session = None
+        self.cache = None
+        self.max_body = config.get("max_body_kb", 2048) * 1024
+        self.retry_after = {}  # host -> loop time before which the host asked us to wait
+
+    async def __aenter__(self):
+        import aiohttp
+        overrides = self.config.get("host_overrides")
+        connector = aiohttp.TCPConnector(
+            limit=self.config.get("max_connections", 100),
+            limit_per_host=self.config.get("per_host_connections", 4),
+            ttl_dns_cache=self.config.get("dns_cache_ttl", 300),
+            keepalive_timeout=self.config.get("keepalive_timeout", 30),
+            resolver=StaticResolver(overrides) if overrides else None
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.config.get("request_timeout", 20),
+            connect=self.config.get("connect_timeout", 5),
+            sock_read=self.config.get("read_timeout", 10)
+        )
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_dns_resolvehost_start.append(self._on_stage_start)
+        trace.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace.on_connection_create_start.append(self._on_stage_start)
+        trace.on_connection_create_end.append(self._on_connect_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_request_end.append(self._on_request_end)
+        self.session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers=self.headers, trace_configs=[trace]
+        )
+        if self.config.get("http_cache", True):
+            self.cache = ResponseCache(
+                max_age=self.config.get("http_cache_max_age", 3600),
+                max_bytes=self.config.get("http_cache_max_mb", 50) * 1024 * 1024
+            )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        if self.cache:
+            self.cache.save()
+
+    # Trace hooks: ``ctx`` is private to one request (redirects included),
+    # so stage timings are attributed to the host the request was made to.
+    async def _on_request_start(self, session, ctx, params):
+        if not hasattr(ctx, "host"):
+            ctx.host = host_of(str(params.url))
+            ctx.started = time.monotonic()
+            metrics.incr("requests")
+
+    async def _on_stage_start(self, session, ctx, params):
+        ctx.stage_started = time.monotonic()
+
+    async def _on_dns_end(self, session, ctx, params):
+        metrics.observe(ctx.host, "dns", time.monotonic() - ctx.stage_started)
+
+    async def _on_connect_end(self, session, ctx, params):
+        metrics.observe(ctx.host, "connect", time.monotonic() - ctx.stage_started)
+
+    async def _on_request_exception(self, session, ctx, params):
+        metrics.incr("request_errors")
+
+    async def _on_request_end(self, session, ctx, params):
+        # Headers are in: for the final hop this is the time to first byte
+        metrics.observe(ctx.host, "ttfb", time.monotonic() - ctx.started)
+        resp = params.response
+        if resp.status in (429, 503) and "Retry-After" in resp.headers:
+            delay = parse_retry_after(resp.headers["Retry-After"])
+            if delay is not None:
+                host = host_of(str(params.url))  # same key as the scheduler, port included
+                deadline = asyncio.get_running_loop().time() + delay
+                self.retry_after[host] = max(self.retry_after.get(host, 0), deadline)
+                log_event(logging.WARNING, "retry_after", host=host, delay=delay)
+
+    def retry_after_deadline(self, host):
+        return self.retry_after.get(host, 0)
+
+    def get(self, url, **kwargs):
+        return TimedRequest(self.session.get(url, **kwargs), host_of(url))
+
+    async def resolve_redirect(self, url):
+        """Follow redirects from ``url`` without downloading any body."""
+        async with self.session.head(url, allow_redirects=True) as resp:
+            if resp.status not in (405, 501):
+                return str(resp.url)
+        # HEAD not supported: a GET whose body is never read
+        async with self.get(url) as resp:
+            return str(resp.url)
+
+    def post(self, url, **kwargs):
+        return TimedRequest(self.session.post(url, **kwargs), host_of(url))
+
+    async def fetch_text(self, url, cache=False):
+        """GET ``url`` and return ``(status, text)``.
+
+        With ``cache=True`` the on-disk cache is consulted first: fresh
+        entries are returned without a request, stale ones are revalidated
+        with a conditional GET and reused on 304.
+        """
+        entry = self.cache.get(url) if cache and self.cache else None
+        headers = {}
+        if entry:
+            if self.cache.is_fresh(entry):
+                body = self.cache.read(url)
+                if body is not None:
+                    return 200, body
+            headers = self.cache.validators(entry)
+        async with self.get(url, headers=headers) as resp:
+            if resp.status == 304 and entry:
+                body = self.cache.read(url)
+                if body is not None:
+                    self.cache.refresh(url)
+                    return 200, body
+                async with self.get(url) as full_resp:
+                    return full_resp.status, await read_text(full_resp, self.max_body)
+            text = await read_text(resp, self.max_body)
+            if cache and self.cache and resp.status == 200:
+                self.cache.store(url, text, resp.headers)
+            return resp.status, text
+
+def parse_retry_after(value):
+    """Return the delay in seconds encoded in a Retry-After header, or None."""
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def run_with_client(config, coro_fn, *args):
+    """Run ``coro_fn(client, *args)`` on a fresh client from synchronous code."""
+    async def runner():
+        configure_html_backend(config.get("html_parser", "auto"))
+        async with HttpClient(config) as client:
+            return await coro_fn(client, *args)
+    return asyncio.run(runner())
+
+def load_aggregator_index():
+    if os.path.exists(AGGREGATOR_INDEX_FILE):
+        try:
+            with open(AGGREGATOR_INDEX_FILE, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            log_event(logging.WARNING, "aggregator_index_unreadable", error=str(e))
+    return {}
+
+def save_aggregator_index(index):
+    with open(AGGREGATOR_INDEX_FILE, "w") as f:
+        json.dump(index, f, indent=4)
+
+async def verify_aggregator(client, link):
+    """Return True if ``link`` looks like an aggregator (many contest links)."""
+    status, html = await client.fetch_text(link, cache=True)
+    if status >= 400:
+        return False
+    contest_links = [href for href in extract_hrefs(html)
+                     if "sweep" in href.lower() or "contest" in href.lower() or "giveaway" in href.lower()]
+    return len(contest_links) > 3  # Threshold for aggregator-like sites
+
+# Curated list of hub sites that list sweepstakes aggregators (no API needed)
+DEFAULT_HUB_SITES = (
+    "https://www.liveabout.com/best-sweepstakes-websites-4163145",
+    "https://www.thebalanceeveryday.com/top-sweepstakes-directories-896784",
+    "https://www.sweepstakeslovers.com/resources/",
+    "https://www.contestgirl.com/links/"
+)
+
+async def update_aggregator_urls_async(client, config):
+    console.print(Panel.fit("[bold cyan]Automatically Updating Aggregator URLs[/]", border_style="cyan"))
+    
+    hub_sites = config.get("hub_sites", DEFAULT_HUB_SITES)
+
+    # Candidates verified (or rejected) within the recheck window are not fetched again
+    index = load_aggregator_index()
+    known = set(config["aggregator_urls"])
+    recheck_after = config.get("aggregator_recheck_days", 7) * 86400
+    now = time.time()
+
+    candidates = set()
+    with make_progress() as progress:
         task = progress.add_task("[cyan]Discovering new aggregators...", total=len(hub_sites))
         for hub in hub_sites:
             try:
-                resp = requests.get(hub, timeout=10)
-                if resp.status_code >= 400:
-                    progress.advance(task)
-                    continue
-                soup = BeautifulSoup(resp.text, "html.parser")
-                links = [urljoin(hub, a["href"]) for a in soup.find_all("a", href=True) if a.get("href")]
-                for link in links:
-                    if not link.startswith("http") or link in config["aggregator_urls"]:
-                        continue
-                    try:
-                        # Verify if the link is an aggregator by checking for multiple contest links
-                        link_resp = requests.get(link, timeout=10)
-                        if link_resp.status_code >= 400:
-                            continue
-                        link_soup = BeautifulSoup(link_resp.text, "html.parser")
-                        contest_links = [a["href"] for a in link_soup.find_all("a", href=True) 
-                                       if "sweep" in a["href"].lower() or "contest" in a["href"].lower() or "giveaway" in a["href"].lower()]
-                        if len(contest_links) > 3:  # Threshold for aggregator-like sites
-                            new_aggregators.append(link)
-                            console.print(f"[green]Found new aggregator: {link}[/]")
-                    except Exception as e:
-                        logging.warning(f"Could not verify {link}: {e}")
-                progress.advance(task)
+                status, html = await client.fetch_text(hub, cache=True)
+                if status < 400:
+                    links = [urljoin(hub, href) for href in extract_hrefs(html)]
+                    candidates.update(link for link in links if link.startswith("http") and link not in known)
             except Exception as e:
-                logging.warning(f"Could not scrape hub {hub}: {e}")
-                progress.advance(task)
-    
-    added = 0
-    for url in new_aggregators:
-        if url not in config["aggregator_urls"]:
+                log_event(logging.WARNING, "hub_scrape_failed", url=hub, error=describe_error(e))
+            progress.advance(task)
+
+        stale = [link for link in candidates
+                 if link not in index or now - index[link]["checked"] >= recheck_after]
+        limit = asyncio.Semaphore(config.get("scrape_concurrency", 20))
+        verify_task = progress.add_task("[cyan]Verifying candidates...", total=len(stale))
+
+        async def verify(link):
+            try:
+                async with limit:
+                    is_aggregator = await verify_aggregator(client, link)
+                index[link] = {"aggregator": is_aggregator, "checked": time.time()}
+                if is_aggregator:
+                    console.print(f"[green]Found new aggregator: {link}[/]")
+            except Exception as e:
+                log_event(logging.WARNING, "aggregator_verify_failed", url=link, error=describe_error(e))
+            progress.advance(verify_task)
+
+        await asyncio.gather(*(verify(link) for link in stale))
+
+    new_urls = []
+    for url in sorted(candidates):
+        if url in index and index[url]["aggregator"] and url not in known:
             config["aggregator_urls"].append(url)
-            added += 1
-    save_config(config)
-    console.print(f"[green]Added {added} new aggregator URLs to the list.[/]")
+            known.add(url)
+            new_urls.append(url)
+    added = len(new_urls)
+    save_aggregator_index(index)
+    # ``config`` may carry command-line overrides; only the new URLs are persisted
+    saved = load_config()
+    saved["aggregator_urls"] += [url for url in new_urls if url not in saved["aggregator_urls"]]
+    save_config(saved)
+    console.print(f"[green]Added {added} new aggregator URLs to the list "
+                  f"({len(candidates) - len(stale)} candidates already checked).[/]")
+
+def update_aggregator_urls(config):
+    run_with_client(config, update_aggregator_urls_async, config)
+
+# ========== URL Canonicalization ==========
+DEFAULT_TRACKING_PARAMS = [
+    "utm_*", "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid",
+    "igshid", "_ga", "_gl", "ref_src"
+]
+
+class UrlCanonicalizer:
+    """Normalizes contest URLs so copies of one contest collapse together.
+
+    ``clean`` returns a fetchable URL with tracking parameters (``name`` or
+    ``prefix*`` patterns from ``strip_params``), the fragment, any default
+    port and host case removed. ``key`` reduces a cleaned URL further to a
+    dedup key that also ignores the scheme, a leading ``www.``, trailing
+    slashes and query parameter order.
+    """
+
+    def __init__(self, strip_params=None):
+        patterns = DEFAULT_TRACKING_PARAMS if strip_params is None else strip_params
+        self.exact = {p.lower() for p in patterns if not p.endswith("*")}
+        self.prefixes = tuple(p[:-1].lower() for p in patterns if p.endswith("*"))
+
+    def is_tracking(self, name):
+        name = name.lower()
+        return name in self.exact or (bool(self.prefixes) and name.startswith(self.prefixes))
+
+    def clean(self, url):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+            host = f"{host}:{parts.port}"
+        query = parts.query
+        if query:
+            params = parse_qsl(query, keep_blank_values=True)
+            kept = [(name, value) for name, value in params if not self.is_tracking(name)]
+            if len(kept) != len(params):
+                query = urlencode(kept)
+        return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+    def key(self, url):
+        parts = urlsplit(url)
+        host = parts.netloc
+        if host.startswith("www."):
+            host = host[4:]
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return f"{host}{parts.path.rstrip('/')}?{query}"
+
+# Paths and query parameters that mark an aggregator's outbound redirect links
+DEFAULT_REDIRECT_PATTERNS = [r"/go/", r"/out/", r"/redirect", r"[?&](url|u)="]
+
+class RedirectResolver:
+    """Persistent cache of where redirecting links finally land.
+
+    Only links matching one of ``patterns`` (regular expressions, searched
+    case-insensitively) are treated as redirects; anything else is taken
+    to be a page in its own right.
+    """
+
+    def __init__(self, client, path=REDIRECT_CACHE_FILE, max_age_days=30, patterns=None):
+        self.client = client
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self.patterns = re.compile("|".join(f"(?:{p})" for p in (patterns or DEFAULT_REDIRECT_PATTERNS)),
+                                   re.IGNORECASE)
+        self.targets = {}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self.targets = json.load(f)
+            except (OSError, ValueError) as e:
+                log_event(logging.WARNING, "redirect_cache_unreadable", error=str(e))
+
+    def is_redirect(self, url):
+        return self.patterns.search(url) is not None
+
+    async def resolve(self, url):
+        """Return the final URL ``url`` redirects to (``url`` itself on failure)."""
+        cached = self.targets.get(url)
+        if cached and time.time() - cached[1] < self.max_age:
+            return cached[0]
+        try:
+            target = await self.client.resolve_redirect(url)
+        except Exception as e:
+            log_event(logging.WARNING, "redirect_resolve_failed", url=url, error=describe_error(e))
+            return url
+        self.targets[url] = [target, time.time()]
+        self.dirty = True
+        return target
+
+    def save(self):
+        if not self.dirty:
+            return
+        now = time.time()
+        targets = {url: entry for url, entry in self.targets.items() if now - entry[1] < self.max_age}
+        with open(self.path, "w") as f:
+            json.dump(targets, f)
+        self.dirty = False
 
 # ========== Scraping ==========
-def scrape_contest_urls(aggregator_urls):
-    urls = []
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console
-    ) as progress:
+def host_of(url):
+    return urlparse(url).netloc.lower()
+
+def is_contest_link(link):
+    l = link.lower()
+    return link.startswith("http") and ("sweep" in l or "contest" in l or "giveaway" in l)
+
+async def scrape_contest_urls_async(client, aggregator_urls, concurrency=20, per_host_concurrency=2,
+                                    on_url=None, progress=None, canonicalizer=None, resolver=None):
+    """Crawl all aggregators concurrently through the shared client.
+
+    ``concurrency`` caps the number of pages fetched at once and
+    ``per_host_concurrency`` caps how many of those may hit the same host.
+    Contest links are cleaned by ``canonicalizer`` and deduplicated on its
+    key. With a ``resolver``, links pointing back at the aggregator itself
+    that look like redirects ("/go/" links and the like) are resolved to
+    their destination first. Each newly seen contest URL is awaited into
+    ``on_url`` as soon as it is known, so consumers can start before the
+    crawl ends and plain links are never held up by slow redirects.
+    """
+    canonicalizer = canonicalizer or UrlCanonicalizer()
+    urls = {}  # canonical key -> cleaned URL
+    global_limit = asyncio.Semaphore(concurrency)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(per_host_concurrency))
+
+    async def destination(agg_host, link):
+        if resolver is None or host_of(link) != agg_host or not resolver.is_redirect(link):
+            return link
+        async with global_limit, host_limits[agg_host]:
+            return canonicalizer.clean(await resolver.resolve(link))
+
+    async def crawl(agg, progress, task):
+        try:
+            agg_host = host_of(agg)
+            async with global_limit, host_limits[agg_host]:
+                _, html = await client.fetch_text(agg, cache=True)
+            links = []
+            for href in extract_hrefs(html):
+                link = urljoin(agg, href)
+                if is_contest_link(link):
+                    link = canonicalizer.clean(link)
+                    if canonicalizer.key(link) not in urls:
+                        links.append(link)
+            for resolved in asyncio.as_completed([destination(agg_host, link) for link in dict.fromkeys(links)]):
+                link = await resolved
+                key = canonicalizer.key(link)
+                if key in urls:
+                    continue
+                urls[key] = link
+                if on_url:
+                    await on_url(link)
+        except Exception as e:
+            log_event(logging.WARNING, "aggregator_scrape_failed", url=agg, error=describe_error(e))
+        finally:
+            progress.advance(task)
+
+    async def crawl_all(progress):
         task = progress.add_task("[cyan]Scraping contest URLs...", total=len(aggregator_urls))
-        for agg in aggregator_urls:
+        await asyncio.gather(*(crawl(agg, progress, task) for agg in aggregator_urls))
+
+    if progress is None:
+        with make_progress() as progress:
+            await crawl_all(progress)
+    else:
+        await crawl_all(progress)
+    return list(urls.values())
+
+def scrape_contest_urls(aggregator_urls, config=None):
+    config = config or load_config()
+    return run_with_client(
+        config, scrape_contest_urls_async, aggregator_urls,
+        config.get("scrape_concurrency", 20), config.get("per_host_concurrency", 2)
+    )
+
+# ========== Form Filling ==========
+# Substrings of a field name that map it to a user detail, checked in order
+FIELD_HEURISTICS = [
+    ("email", "email"),
+    ("first", "first_name"),
+    ("last", "last_name"),
+    ("phone", "phone"),
+    ("address", "address"),
+    ("city", "city"),
+    ("state", "state"),
+    ("zip", "zip")
+]
+
+class FormFiller:
+    """Turns extracted forms into form data using cached fill plans.
+
+    FIELD_HEURISTICS are compiled into a single pattern, and each field
+    name is resolved (``field_mappings`` first, then the pattern) only once.
+    The resulting plan for a form is cached under a fingerprint of its
+    structure (action, method, fields) and persisted to FORM_PLAN_FILE, so a
+    form seen before only has its dynamic values (hidden inputs,
+    checkbox/radio values, select options) read again.
+    """
+
+    def __init__(self, field_mappings, plan_file=FORM_PLAN_FILE, max_plans=5000):
+        self.field_mappings = field_mappings
+        self.plan_file = plan_file
+        self.max_plans = max_plans
+        # One lookahead per rule, tried in order, so the first matching rule wins
+        # regardless of where its substring appears in the name
+        self.pattern = re.compile(
+            "^(?:" + "|".join(f"(?=.*?(?P<{key}>{re.escape(token)}))" for token, key in FIELD_HEURISTICS) + ")",
+            re.IGNORECASE | re.DOTALL
+        )
+        self.mappings_key = json.dumps(field_mappings, sort_keys=True)
+        self.resolved = {}
+        self.plans = {}
+        self.new_plans = {}
+        if os.path.exists(plan_file):
             try:
-                resp = requests.get(agg, timeout=10)
-                soup = BeautifulSoup(resp.text, "html.parser")
-                links = [urljoin(agg, a["href"]) for a in soup.find_all("a", href=True) if a.get("href")]
-                urls.extend([l for l in links if l.startswith("http") and ("sweep" in l.lower() or "contest" in l.lower() or "giveaway" in l.lower())])
-                progress.advance(task)
-            except Exception as e:
-                logging.warning(f"Could not scrape {agg}: {e}")
-                progress.advance(task)
-    return list(set(urls))
+                with open(plan_file, "r") as f:
+                    self.plans = json.load(f)
+            except (OSError, ValueError) as e:
+                log_event(logging.WARNING, "form_plan_cache_unreadable", error=str(e))
+
+    def resolve(self, name):
+        """Return the ``[kind, arg]`` source for a free-text field called ``name``."""
+        source = self.resolved.get(name)
+        if source is None:
+            if name in self.field_mappings:
+                source = ["user", self.field_mappings[name]]
+            else:
+                match = self.pattern.match(name)
+                source = ["user", match.lastgroup] if match else ["const", "test"]
+            self.resolved[name] = source
+        return source
+
+    def fingerprint(self, form):
+        structure = [
+            self.mappings_key, form["action"], form["method"],
+            [[field["tag"], field["name"], field["type"]] for field in form["fields"]]
+        ]
+        return hashlib.sha1(json.dumps(structure).encode("utf-8")).hexdigest()
+
+    def compile(self, form):
+        plan = []
+        for index, field in enumerate(form["fields"]):
+            name = field["name"]
+            if not name:
+                continue
+            if field["tag"] == "input":
+                input_type = field["type"]
+                if input_type in ("submit", "button", "image"):
+                    continue
+                if input_type in ("checkbox", "radio", "hidden"):
+                    plan.append([name, input_type, index])
+                else:  # text, email, tel, etc.
+                    plan.append([name] + self.resolve(name))
+            elif field["tag"] == "textarea":
+                plan.append([name, "const", "N/A"])
+            elif field["tag"] == "select":
+                plan.append([name, "select", index])
+        return plan
+
+    def fill(self, form, user_data, form_data):
+        """Add the values for ``form`` to ``form_data`` and return it."""
+        key = self.fingerprint(form)
+        plan = self.plans.get(key)
+        if plan is None:
+            plan = self.plans[key] = self.new_plans[key] = self.compile(form)
+        fields = form["fields"]
+        for name, kind, arg in plan:
+            if kind == "user":
+                form_data[name] = user_data.get(arg, "")
+            elif kind == "const":
+                form_data[name] = arg
+            elif kind == "checkbox":
+                value = fields[arg]["value"]
+                form_data[name] = "on" if value is None else value  # Auto-check checkboxes
+            elif kind == "radio":
+                if name not in form_data:
+                    form_data[name] = fields[arg]["value"] or ""
+            elif kind == "hidden":
+                form_data[name] = fields[arg]["value"] or ""
+            elif kind == "select":
+                if fields[arg]["options"]:
+                    form_data[name] = fields[arg]["options"][0]
+        return form_data
+
+    def save(self):
+        """Merge newly compiled plans into the plan file."""
+        if not self.new_plans:
+            return
+        plans = {}
+        if os.path.exists(self.plan_file):
+            try:
+                with open(self.plan_file, "r") as f:
+                    plans = json.load(f)
+            except (OSError, ValueError):
+                pass
+        plans.update(self.new_plans)
+        if len(plans) > self.max_plans:
+            plans = dict(list(plans.items())[-self.max_plans:])
+        with open(self.plan_file, "w") as f:
+            json.dump(plans, f)
+        self.new_plans = {}
+
+# ========== Negative Cache ==========
+class NoFormCache:
+    """Remembers pages, and URL patterns, that turned out to have no form.
+
+    A URL that returned no form is skipped until ``max_age_days`` have
+    passed. URLs are also grouped by host and first path segment (e.g.
+    ``example.com/category/*``); once ``pattern_threshold`` URLs in a group
+    had no form and none had one, the whole group is skipped.
+    """
+
+    def __init__(self, path=NO_FORM_CACHE_FILE, max_age_days=7, pattern_threshold=5):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self.pattern_threshold = pattern_threshold
+        self.urls = {}      # url -> time it was found to have no form
+        self.patterns = {}  # pattern -> {"misses": n, "forms": n, "last": time}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                self.urls = data.get("urls", {})
+                self.patterns = data.get("patterns", {})
+            except (OSError, ValueError) as e:
+                log_event(logging.WARNING, "no_form_cache_unreadable", error=str(e))
+
+    @staticmethod
+    def pattern_of(url):
+        parts = urlsplit(url)
+        segments = [segment for segment in parts.path.split("/") if segment]
+        if len(segments) < 2:
+            return None
+        return f"{parts.netloc}/{segments[0]}/*"
+
+    def blocks(self, url):
+        now = time.time()
+        seen = self.urls.get(url)
+        if seen is not None and now - seen < self.max_age:
+            return True
+        stats = self.patterns.get(self.pattern_of(url))
+        return bool(stats) and stats["forms"] == 0 and stats["misses"] >= self.pattern_threshold \
+            and now - stats["last"] < self.max_age
+
+    def _pattern_stats(self, url):
+        pattern = self.pattern_of(url)
+        if pattern is None:
+            return None
+        return self.patterns.setdefault(pattern, {"misses": 0, "forms": 0, "last": 0})
+
+    def record_miss(self, url):
+        self.urls[url] = time.time()
+        stats = self._pattern_stats(url)
+        if stats is not None:
+            stats["misses"] += 1
+            stats["last"] = time.time()
+
+    def record_form(self, url):
+        self.urls.pop(url, None)
+        stats = self._pattern_stats(url)
+        if stats is not None:
+            stats["forms"] += 1
+
+    def save(self):
+        cutoff = time.time() - self.max_age
+        data = {
+            "urls": {url: seen for url, seen in self.urls.items() if seen >= cutoff},
+            "patterns": {pattern: stats for pattern, stats in self.patterns.items() if stats["last"] >= cutoff}
+        }
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+# ========== Retry Policy ==========
+RETRIABLE_STATUSES = (408, 429)  # plus every 5xx
+GONE_STATUSES = (404, 410)
+CIRCUIT_OPEN = "Skipped: host circuit open"
+
+class HttpStatusError(Exception):
+    """An HTTP response that ends an attempt without a usable page."""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = parse_retry_after(retry_after) if retry_after else None
+
+def is_dns_error(error):
+    import aiohttp
+    return isinstance(error, aiohttp.ClientConnectorError) and isinstance(error.os_error, socket.gaierror)
+
+def describe_error(error):
+    return str(error) or type(error).__name__
+
+def classify_error(error):
+    """Return ``(retriable, host_down)`` for an exception raised by an attempt.
+
+    Timeouts, dropped connections, 408/429 and 5xx responses are worth
+    retrying; DNS failures, 404/410 and anything unexpected are not.
+    ``host_down`` marks failures that count against the host's breaker.
+    """
+    if isinstance(error, HttpStatusError):
+        if error.status in RETRIABLE_STATUSES:
+            return True, False
+        return error.status >= 500, error.status >= 500
+    if is_dns_error(error):
+        return False, True
+    import aiohttp
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return True, True
+    return False, False
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped at ``max_delay``."""
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, attempt):
+        return attempt + 1 < self.max_attempts
+
+    def delay(self, attempt, error=None):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+class CircuitBreakers:
+    """Per-host circuit breakers, persisted across runs.
+
+    After ``threshold`` consecutive host-level failures (or a single DNS
+    failure) a host's circuit opens and its URLs are skipped for
+    ``cooldown`` seconds. After that one probe request is let through: a
+    success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(self, path=CIRCUIT_FILE, threshold=5, cooldown_minutes=30):
+        self.path = path
+        self.threshold = threshold
+        self.cooldown = cooldown_minutes * 60
+        self.hosts = {}  # host -> {"failures": n, "opened": time or None}
+        self.probing = set()
+        self.touched = set()
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self.hosts = json.load(f)
+            except (OSError, ValueError) as e:
+                log_event(logging.WARNING, "circuit_state_unreadable", error=str(e))
+
+    def allow(self, host):
+        state = self.hosts.get(host)
+        if not state or state["opened"] is None:
+            return True
+        if time.time() - state["opened"] < self.cooldown or host in self.probing:
+            return False
+        self.probing.add(host)
+        return True
+
+    def record_failure(self, host, trip=False):
+        state = self.hosts.setdefault(host, {"failures": 0, "opened": None})
+        state["failures"] += 1
+        self.probing.discard(host)
+        self.touched.add(host)
+        if trip or state["failures"] >= self.threshold or state["opened"] is not None:
+            if state["opened"] is None:
+                log_event(logging.WARNING, "circuit_opened", host=host, failures=state["failures"])
+            state["opened"] = time.time()
+
+    def record_success(self, host):
+        self.probing.discard(host)
+        if host in self.hosts:
+            del self.hosts[host]
+            self.touched.add(host)
+
+    def save(self):
+        """Merge the hosts this process touched into the state file."""
+        if not self.touched:
+            return
+        hosts = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    hosts = json.load(f)
+            except (OSError, ValueError):
+                pass
+        for host in self.touched:
+            if host in self.hosts:
+                hosts[host] = self.hosts[host]
+            else:
+                hosts.pop(host, None)
+        with open(self.path, "w") as f:
+            json.dump(hosts, f, indent=4)
+        self.touched = set()
 
 # ========== Form Submission ==========
-async def submit_form_async(url, user_data, headers, field_mappings, retries, api_key):
-    for attempt in range(retries):
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=15) as resp:
-                    html = await resp.text()
-                    soup = BeautifulSoup(html, "html.parser")
-                    forms = soup.find_all("form")
-                    if not forms:
-                        return False, attempt, "No forms found"
-
-                    form = forms[0]  # first form for demo
-                    method = form.get("method", "post").lower()
-                    inputs = form.find_all(["input", "select", "textarea"])
-                    form_data = {}
-
-                    # CAPTCHA detection and solving
-                    recaptcha_div = soup.find("div", class_="g-recaptcha")
-                    if recaptcha_div:
-                        sitekey = recaptcha_div.get("data-sitekey")
-                        if not sitekey:
-                            return False, attempt, "CAPTCHA detected but no sitekey"
-                        if not api_key:
-                            return False, attempt, "CAPTCHA detected, no API key"
-                        try:
-                            from twocaptcha import TwoCaptcha
-                        except ImportError:
-                            return False, attempt, "2captcha library not installed"
-                        solver = TwoCaptcha(api_key)
-                        try:
-                            loop = asyncio.get_event_loop()
-                            result = await loop.run_in_executor(None, lambda: solver.recaptcha(sitekey=sitekey, url=url))
-                            form_data['g-recaptcha-response'] = result['code']
-                        except Exception as e:
-                            return False, attempt, f"CAPTCHA solve failed: {str(e)}"
-
-                    # hCaptcha detection
-                    hcaptcha_div = soup.find("div", class_="h-captcha")
-                    if hcaptcha_div:
-                        sitekey = hcaptcha_div.get("data-sitekey")
-                        if not sitekey:
-                            return False, attempt, "hCAPTCHA detected but no sitekey"
-                        if not api_key:
-                            return False, attempt, "hCAPTCHA detected, no API key"
-                        try:
-                            from twocaptcha import TwoCaptcha
-                        except ImportError:
-                            return False, attempt, "2captcha library not installed"
-                        solver = TwoCaptcha(api_key)
-                        try:
-                            loop = asyncio.get_event_loop()
-                            result = await loop.run_in_executor(None, lambda: solver.hcaptcha(sitekey=sitekey, url=url))
-                            form_data['h-captcha-response'] = result['code']
-                        except Exception as e:
-                            return False, attempt, f"hCAPTCHA solve failed: {str(e)}"
-
-                    for i in inputs:
-                        name = i.get("name")
-                        if not name:
-                            continue
-                        if i.name == "input":
-                            input_type = i.get("type", "text").lower()
-                            if input_type in ("submit", "button", "image"):
-                                continue
-                            if input_type == "checkbox":
-                                form_data[name] = i.get("value", "on")  # Auto-check checkboxes
-                            elif input_type == "radio":
-                                if name not in form_data:
-                                    form_data[name] = i.get("value", "")
-                            elif input_type == "hidden":
-                                form_data[name] = i.get("value", "")
-                            else:  # text, email, tel, etc.
-                                if name in field_mappings:
-                                    form_data[name] = user_data.get(field_mappings[name], "")
-                                elif "email" in name.lower():
-                                    form_data[name] = user_data["email"]
-                                elif "first" in name.lower():
-                                    form_data[name] = user_data["first_name"]
-                                elif "last" in name.lower():
-                                    form_data[name] = user_data["last_name"]
-                                elif "phone" in name.lower():
-                                    form_data[name] = user_data["phone"]
-                                elif "address" in name.lower():
-                                    form_data[name] = user_data["address"]
-                                elif "city" in name.lower():
-                                    form_data[name] = user_data["city"]
-                                elif "state" in name.lower():
-                                    form_data[name] = user_data["state"]
-                                elif "zip" in name.lower():
-                                    form_data[name] = user_data["zip"]
-                                else:
-                                    form_data[name] = "test"
-                        elif i.name == "textarea":
-                            form_data[name] = "N/A"
-                        elif i.name == "select":
-                            options = i.find_all("option")
-                            if options:
-                                for opt in options:
-                                    if opt.get("value"):
-                                        form_data[name] = opt["value"]
-                                        break
-
-                    action = urljoin(url, form.get("action") or "")
-
-                    if method == "post":
-                        async with session.post(action, data=form_data, headers=headers) as submit_resp:
-                            text = await submit_resp.text()
-                            if submit_resp.status < 400 or any(word in text.lower() for word in ["thank", "success", "entered", "submitted"]):
-                                return True, attempt, "Submitted"
-                            else:
-                                return False, attempt, f"HTTP {submit_resp.status} - {text[:100]}"
-                    elif method == "get":
-                        async with session.get(action, params=form_data, headers=headers) as submit_resp:
-                            text = await submit_resp.text()
-                            if submit_resp.status < 400 or any(word in text.lower() for word in ["thank", "success", "entered", "submitted"]):
-                                return True, attempt, "Submitted"
-                            else:
-                                return False, attempt, f"HTTP {submit_resp.status} - {text[:100]}"
-                    else:
-                        return False, attempt, f"Unsupported method: {method}"
+NO_FORMS = "No forms found"
+# Results that mean the page has no form to enter, now or in future
+NO_FORM_REASONS = (NO_FORMS,) + tuple(f"HTTP {status}" for status in GONE_STATUSES)
+SUCCESS_PATTERN = re.compile(r"thank|success|entered|submitted", re.IGNORECASE)
+
+async def submit_form_async(client, url, user_data, headers, filler, api_key, scan_bytes=262144,
+                            success_bytes=65536):
+    """Make one attempt at entering the contest at ``url``.
+
+    Returns ``(submitted, reason)``. Responses that should be retried or
+    that mean the page is gone raise HttpStatusError; other non-2xx
+    responses (401, 403, ...) fail with ``HTTP <status>`` and are not taken
+    as proof the page has no form. Network errors propagate unchanged for
+    classify_error to judge.
+    """
+    async with client.get(url, headers=headers) as resp:
+        if resp.status in RETRIABLE_STATUSES or resp.status >= 500 or resp.status in GONE_STATUSES:
+            raise HttpStatusError(resp.status, resp.headers.get("Retry-After"))
+        if resp.status >= 300:
+            return False, f"HTTP {resp.status}"
+        # Give up early on pages with no form, and stop reading after the first one
+        html = await read_text(resp, client.max_body, require=b"<form", require_within=scan_bytes,
+                               stop_after=b"</form>")
+        form = extract_form(html) if html is not None else None  # first form for demo
+        if form is None:
+            return False, NO_FORMS  # permanent for this page, never retried
+
+        method = form["method"]
+        form_data = {}
+
+        # CAPTCHA detection and solving
+        if form["recaptcha_sitekey"] is not None:
+            sitekey = form["recaptcha_sitekey"]
+            if not sitekey:
+                return False, "CAPTCHA detected but no sitekey"
+            if not api_key:
+                return False, "CAPTCHA detected, no API key"
+            try:
+                from twocaptcha import TwoCaptcha
+            except ImportError:
+                return False, "2captcha library not installed"
+            solver = TwoCaptcha(api_key)
+            try:
+                loop = asyncio.get_event_loop()
+                result = await loop.run_in_executor(None, lambda: solver.recaptcha(sitekey=sitekey, url=url))
+                form_data['g-recaptcha-response'] = result['code']
+            except Exception as e:
+                return False, f"CAPTCHA solve failed: {str(e)}"
+
+        # hCaptcha detection
+        if form["hcaptcha_sitekey"] is not None:
+            sitekey = form["hcaptcha_sitekey"]
+            if not sitekey:
+                return False, "hCAPTCHA detected but no sitekey"
+            if not api_key:
+                return False, "hCAPTCHA detected, no API key"
+            try:
+                from twocaptcha import TwoCaptcha
+            except ImportError:
+                return False, "2captcha library not installed"
+            solver = TwoCaptcha(api_key)
+            try:
+                loop = asyncio.get_event_loop()
+                result = await loop.run_in_executor(None, lambda: solver.hcaptcha(sitekey=sitekey, url=url))
+                form_data['h-captcha-response'] = result['code']
+            except Exception as e:
+                return False, f"hCAPTCHA solve failed: {str(e)}"
 
+        filler.fill(form, user_data, form_data)
+
+        action = urljoin(url, form["action"] or "")
+
+        if method == "post":
+            async with client.post(action, data=form_data, headers=headers) as submit_resp:
+                text = await read_text(submit_resp, success_bytes)
+                if submit_resp.status < 400 or SUCCESS_PATTERN.search(text):
+                    return True, "Submitted"
+                if submit_resp.status in RETRIABLE_STATUSES or submit_resp.status >= 500:
+                    raise HttpStatusError(submit_resp.status, submit_resp.headers.get("Retry-After"))
+                return False, f"HTTP {submit_resp.status} - {text[:100]}"
+        elif method == "get":
+            async with client.get(action, params=form_data, headers=headers) as submit_resp:
+                text = await read_text(submit_resp, success_bytes)
+                if submit_resp.status < 400 or SUCCESS_PATTERN.search(text):
+                    return True, "Submitted"
+                if submit_resp.status in RETRIABLE_STATUSES or submit_resp.status >= 500:
+                    raise HttpStatusError(submit_resp.status, submit_resp.headers.get("Retry-After"))
+                return False, f"HTTP {submit_resp.status} - {text[:100]}"
+        else:
+            return False, f"Unsupported method: {method}"
+
+class ContestSubmitter:
+    """Makes single submission attempts and decides what happens next.
+
+    ``attempt`` returns ``(record, None)`` once a URL is finished, or
+    ``(None, delay)`` when it should be retried after ``delay`` seconds.
+    Hosts whose circuit breaker is open are answered without a request.
+    """
+
+    def __init__(self, client, user_data, config, filler, breakers):
+        self.client = client
+        self.user_data = user_data
+        self.config = config
+        self.filler = filler
+        self.breakers = breakers
+        self.policy = RetryPolicy(
+            config["max_retries"],
+            config.get("retry_base_delay", 1.0),
+            config.get("retry_max_delay", 60.0)
+        )
+        self.scan_bytes = config.get("form_scan_kb", 256) * 1024
+        self.success_bytes = config.get("success_scan_kb", 64) * 1024
+
+    async def attempt(self, url, attempt):
+        host = host_of(url)
+        started = time.monotonic()
+
+        def record(submitted, reason, forms):
+            return {"url": url, "submitted": submitted, "retries": attempt, "reason": reason,
+                    "forms": forms, "duration": time.monotonic() - started}
+
+        if not self.breakers.allow(host):
+            metrics.incr("circuit_skips")
+            return record(False, CIRCUIT_OPEN, 0), None
+        try:
+            submitted, reason = await submit_form_async(
+                self.client, url, self.user_data, {"User-Agent": "Mozilla/5.0"},
+                self.filler, self.config["twocaptcha_api_key"], self.scan_bytes, self.success_bytes
+            )
         except Exception as e:
-            logging.error(f"Error on {url}: {e}")
-    return False, retries, "Failed after retries"
+            retriable, host_down = classify_error(e)
+            if host_down:
+                self.breakers.record_failure(host, trip=is_dns_error(e))
+            else:
+                self.breakers.record_success(host)
+            if retriable and self.policy.should_retry(attempt):
+                delay = self.policy.delay(attempt, e)
+                metrics.incr("retries")
+                log_event(logging.WARNING, "attempt_failed", url=url, attempt=attempt + 1,
+                          error=describe_error(e), retry_in=round(delay, 1))
+                return None, delay
+            log_event(logging.ERROR, "submission_failed", url=url, attempt=attempt + 1, error=describe_error(e))
+            if retriable:
+                return record(False, f"Failed after retries: {describe_error(e)}", 0), None
+            if isinstance(e, HttpStatusError):
+                return record(False, str(e), 0), None
+            return record(False, f"Error: {describe_error(e)}", 0), None
+        self.breakers.record_success(host)
+        return record(submitted, reason, 0 if reason == NO_FORMS else 1), None
+
+# ========== Scheduling ==========
+class SubmissionScheduler:
+    """Fair, polite dispatcher for form submissions.
+
+    URLs are queued per host and handed to a fixed pool of workers in
+    round-robin order, so a host with hundreds of links cannot starve the
+    others. A host is only dispatched again once ``min_host_interval``
+    seconds have passed since its last request and any ``Retry-After`` it
+    sent has expired. At most ``max_pending`` URLs are buffered; ``put``
+    blocks beyond that so a fast producer cannot outrun the workers.
+    Retries are parked until their backoff expires without holding a
+    worker.
+    """
+
+    def __init__(self, client, concurrency=10, min_host_interval=1.0, max_pending=1000):
+        self.client = client
+        self.concurrency = concurrency
+        self.min_host_interval = min_host_interval
+        self.max_pending = max_pending
+        self.queues = {}          # host -> deque of pending (url, attempt)
+        self.rotation = deque()   # hosts with pending URLs, in round-robin order
+        self.next_slot = {}       # host -> loop time of its next allowed request
+        self.delayed = []         # heap of (ready time, url, attempt) waiting to be retried
+        self.pending = 0
+        self.in_flight = 0
+        self.closed = False
+        self.wakeup = asyncio.Condition()
+
+    def _enqueue(self, url, attempt):
+        host = host_of(url)
+        if host not in self.queues:
+            self.queues[host] = deque()
+            self.rotation.append(host)
+        self.queues[host].append((url, attempt))
+
+    def _record_depth(self):
+        metrics.gauge("submit_queue_depth", self.pending)
+        metrics.gauge("submit_in_flight", self.in_flight)
+
+    async def put(self, url):
+        async with self.wakeup:
+            while self.pending >= self.max_pending:
+                await self.wakeup.wait()
+            self._enqueue(url, 0)
+            self.pending += 1
+            self._record_depth()
+            self.wakeup.notify_all()
+
+    async def retry(self, url, attempt, delay):
+        """Queue ``url`` for another ``attempt`` once ``delay`` seconds have passed."""
+        ready = asyncio.get_running_loop().time() + delay
+        async with self.wakeup:
+            heapq.heappush(self.delayed, (ready, url, attempt))
+            self.pending += 1
+            self._record_depth()
+            self.wakeup.notify_all()
+
+    async def close(self):
+        """Signal that no more URLs will be added."""
+        async with self.wakeup:
+            self.closed = True
+            self.wakeup.notify_all()
+
+    def _ready_at(self, host):
+        return max(self.next_slot.get(host, 0), self.client.retry_after_deadline(host))
+
+    async def _take(self):
+        loop = asyncio.get_running_loop()
+        async with self.wakeup:
+            while True:
+                now = loop.time()
+                while self.delayed and self.delayed[0][0] <= now:
+                    _, url, attempt = heapq.heappop(self.delayed)
+                    self._enqueue(url, attempt)
+                earliest = self.delayed[0][0] if self.delayed else None
+                for _ in range(len(self.rotation)):
+                    host = self.rotation[0]
+                    self.rotation.rotate(-1)
+                    ready = self._ready_at(host)
+                    if ready <= now:
+                        host_queue = self.queues[host]
+                        entry = host_queue.popleft()
+                        self.pending -= 1
+                        self.in_flight += 1
+                        if not host_queue:
+                            del self.queues[host]
+                            self.rotation.pop()
+                        self.next_slot[host] = now + self.min_host_interval
+                        self._record_depth()
+                        self.wakeup.notify_all()
+                        return entry
+                    earliest = ready if earliest is None else min(earliest, ready)
+                # An in-flight URL may still be handed back for a retry
+                if self.closed and not self.pending and not self.in_flight:
+                    return None
+                timeout = None if earliest is None else earliest - now
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _worker(self, handler):
+        while True:
+            entry = await self._take()
+            if entry is None:
+                return
+            try:
+                await handler(*entry)
+            finally:
+                async with self.wakeup:
+                    self.in_flight -= 1
+                    self._record_depth()
+                    self.wakeup.notify_all()
+
+    async def run(self, handler):
+        """Run ``handler(url, attempt)`` for every queued URL until closed and drained."""
+        await asyncio.gather(*(self._worker(handler) for _ in range(self.concurrency)))
+
+# ========== Sharded Submission ==========
+def run_submission_shard(index, config, user_data, inbox, outbox):
+    """Worker process entry point: submit every URL sent to ``inbox``.
+
+    Each shard has its own event loop, HTTP client and scheduler. Results
+    are sent back to the parent on ``outbox`` as they complete, followed by
+    the shard's metrics once its inbox is drained.
+    """
+    init_logging()
+    configure_html_backend(config.get("html_parser", "auto"))
+    asyncio.run(_run_submission_shard_async(index, config, user_data, inbox, outbox))
+    outbox.put(("metrics", index, metrics.snapshot()))
+    outbox.put(("done", index, None))
+
+async def _run_submission_shard_async(index, config, user_data, inbox, outbox):
+    loop = asyncio.get_running_loop()
+    # The page cache is owned by the parent; submissions never use it anyway
+    filler = FormFiller(config["field_mappings"])
+    breakers = CircuitBreakers(
+        threshold=config.get("breaker_threshold", 5),
+        cooldown_minutes=config.get("breaker_cooldown_minutes", 30)
+    )
+    async with HttpClient(dict(config, http_cache=False)) as client:
+        contest_submitter = ContestSubmitter(client, user_data, config, filler, breakers)
+        scheduler = SubmissionScheduler(
+            client,
+            config.get("submit_concurrency", 10),
+            config.get("min_host_interval", 1.0),
+            config.get("queue_size", 1000)
+        )
+
+        async def feed():
+            while True:
+                url = await loop.run_in_executor(None, inbox.get)
+                if url is None:
+                    break
+                await scheduler.put(url)
+            await scheduler.close()
+
+        async def submit(url, attempt):
+            result, delay = await contest_submitter.attempt(url, attempt)
+            if result is None:
+                await scheduler.retry(url, attempt + 1, delay)
+            else:
+                outbox.put(("result", index, result))
+
+        await asyncio.gather(feed(), scheduler.run(submit))
+    filler.save()
+    breakers.save()
+
+class ShardedSubmitter:
+    """Spread form submission over several worker processes.
+
+    URLs are sharded by host, so per-host spacing still holds inside each
+    worker. If a worker dies, only the URLs it had been sent but not yet
+    answered are reported as failed, and a fresh worker takes over its
+    shard for anything discovered afterwards.
+    """
+
+    def __init__(self, config, user_data, workers, max_pending=1000):
+        self.config = config
+        self.user_data = user_data
+        self.max_pending = max_pending
+        self.context = multiprocessing.get_context("spawn")
+        self.outbox = self.context.Queue()
+        self.shards = [self._spawn(index) for index in range(workers)]
+        self.outstanding = 0
+        self.closed = False
+        self.wakeup = asyncio.Condition()
+
+    def _spawn(self, index):
+        inbox = self.context.Queue()
+        process = self.context.Process(
+            target=run_submission_shard,
+            args=(index, self.config, self.user_data, inbox, self.outbox),
+            daemon=True
+        )
+        process.start()
+        return {"process": process, "inbox": inbox, "in_flight": set(), "done": False}
+
+    async def put(self, url):
+        async with self.wakeup:
+            while self.outstanding >= self.max_pending:
+                await self.wakeup.wait()
+            self.outstanding += 1
+            metrics.gauge("submit_outstanding", self.outstanding)
+        shard = self.shards[zlib.crc32(host_of(url).encode("utf-8")) % len(self.shards)]
+        shard["in_flight"].add(url)
+        shard["inbox"].put(url)
+
+    async def close(self):
+        self.closed = True
+        for shard in self.shards:
+            shard["inbox"].put(None)
+
+    def _poll(self):
+        try:
+            return self.outbox.get(timeout=0.2)
+        except queue.Empty:
+            return None
+
+    async def _completed(self, count):
+        async with self.wakeup:
+            self.outstanding -= count
+            metrics.gauge("submit_outstanding", self.outstanding)
+            self.wakeup.notify_all()
+
+    async def _reap(self, index, on_result):
+        shard = self.shards[index]
+        exitcode = shard["process"].exitcode
+        log_event(logging.ERROR, "worker_exited", worker=index, exitcode=exitcode,
+                  lost=len(shard["in_flight"]))
+        for url in shard["in_flight"]:
+            on_result({"url": url, "submitted": False, "retries": 0, "forms": 0,
+                       "reason": f"Error: worker exited with code {exitcode}"})
+        await self._completed(len(shard["in_flight"]))
+        if self.closed:
+            shard["in_flight"].clear()
+            shard["done"] = True
+        else:
+            self.shards[index] = self._spawn(index)
+
+    async def _handle(self, message, on_result):
+        kind, index, record = message
+        shard = self.shards[index]
+        if kind == "done":
+            shard["done"] = True
+        elif kind == "metrics":
+            metrics.merge(record)
+        elif record["url"] in shard["in_flight"]:
+            shard["in_flight"].discard(record["url"])
+            on_result(record)
+            await self._completed(1)
+
+    async def run(self, on_result):
+        """Call ``on_result(record)`` for every result until all shards finish."""
+        loop = asyncio.get_running_loop()
+        while not all(shard["done"] for shard in self.shards):
+            message = await loop.run_in_executor(None, self._poll)
+            if message is not None:
+                await self._handle(message, on_result)
+                continue
+            dead = [index for index, shard in enumerate(self.shards)
+                    if not shard["done"] and not shard["process"].is_alive()]
+            if not dead:
+                continue
+            # A shard that exited may still have results (or its "done") queued
+            # behind the poll timeout; only what is left in flight after that is lost
+            while True:
+                try:
+                    message = self.outbox.get_nowait()
+                except queue.Empty:
+                    break
+                await self._handle(message, on_result)
+            for index in dead:
+                if not self.shards[index]["done"]:
+                    await self._reap(index, on_result)
+        # Reap the finished shards so they do not linger as zombies between daemon runs
+        for shard in self.shards:
+            await loop.run_in_executor(None, shard["process"].join, 10)
+
+# ========== Ledger ==========
+OUTCOMES = ("success", "captcha", "no_form", "failed")
+
+def result_outcome(submitted, reason):
+    if submitted:
+        return "success"
+    if "CAPTCHA" in reason:
+        return "captcha"
+    if "No forms" in reason:
+        return "no_form"
+    return "failed"
+
+# URLs, and the host in "Cannot connect to host example.com:443 ssl:default [...]"
+ERROR_DETAIL_PATTERN = re.compile(r"https?://[^\s'\"]+|(?<=host )\S+( ssl:\S+)?")
+
+def reason_group(reason):
+    # Drop the response text after "HTTP 403 - ..." and the URL or host an error
+    # names, so the same failure on different sites groups together
+    reason = reason.split(" - ", 1)[0]
+    reason = ERROR_DETAIL_PATTERN.sub(lambda m: "<url>" if m.group().startswith("http") else "<host>", reason)
+    return reason[:80]
+
+class EntryLedger:
+    """SQLite record of every submission, kept across runs.
+
+    ``results`` holds one row per URL per run; ``entries`` holds one row per
+    URL with its attempt count and when it was last attempted and last
+    successfully entered. ``result_summary`` keeps running counts and
+    durations per run, host, outcome and reason, so a run can be summarised
+    without reading its results. Rows are buffered and written in batches.
+    """
+
+    def __init__(self, path=LEDGER_FILE, batch_size=100):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started REAL NOT NULL,
+                duration REAL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                run_id INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                submitted INTEGER NOT NULL,
+                retries INTEGER NOT NULL,
+                reason TEXT NOT NULL,
+                forms INTEGER NOT NULL,
+                duration REAL,
+                finished REAL NOT NULL,
+                host TEXT NOT NULL,
+                outcome TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_by_run_host ON results (run_id, host);
+            CREATE INDEX IF NOT EXISTS results_by_run_outcome ON results (run_id, outcome);
+            CREATE TABLE IF NOT EXISTS result_summary (
+                run_id INTEGER NOT NULL,
+                host TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                total_duration REAL NOT NULL,
+                max_duration REAL NOT NULL,
+                PRIMARY KEY (run_id, host, outcome, reason)
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL,
+                last_attempted REAL NOT NULL,
+                last_entered REAL,
+                last_reason TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entries_by_last_entered ON entries (last_entered);
+        """)
+        self.batch_size = batch_size
+        self.pending = []
+        self.run_id = None
+
+    def start_run(self):
+        cursor = self.db.execute("INSERT INTO runs (started) VALUES (?)", (time.time(),))
+        self.db.commit()
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def resume_run(self, run_id):
+        """Continue recording into ``run_id``; return the URLs it already has."""
+        self.run_id = run_id
+        rows = self.db.execute("SELECT url FROM results WHERE run_id = ?", (run_id,))
+        return {url for (url,) in rows}
+
+    def finish_run(self, duration):
+        self.flush()
+        self.db.execute("UPDATE runs SET duration = ? WHERE id = ?", (duration, self.run_id))
+        self.db.commit()
+
+    def record(self, result):
+        self.pending.append((
+            self.run_id, result["url"], int(result["submitted"]), result["retries"],
+            result["reason"], result.get("forms", 0), result.get("duration"), time.time(),
+            host_of(result["url"]), result_outcome(result["submitted"], result["reason"])
+        ))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO results (run_id, url, submitted, retries, reason, forms, duration, finished, "
+                "host, outcome) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self.pending
+            )
+            self._summarise(self.pending)
+            self.db.executemany(
+                "INSERT INTO entries (url, attempts, last_attempted, last_entered, last_reason) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET "
+                "attempts = attempts + excluded.attempts, "
+                "last_attempted = excluded.last_attempted, "
+                "last_entered = COALESCE(excluded.last_entered, last_entered), "
+                "last_reason = excluded.last_reason",
+                [(row[1], row[3] + 1, row[7], row[7] if row[2] else None, row[4]) for row in self.pending]
+            )
+        self.pending = []
+
+    def _summarise(self, rows):
+        """Fold results rows (as written to ``results``) into the running summary."""
+        groups = {}
+        for row in rows:
+            key = (row[0], row[8], row[9], reason_group(row[4]))
+            duration = row[6] or 0.0
+            count, total, longest = groups.get(key, (0, 0.0, 0.0))
+            groups[key] = (count + 1, total + duration, max(longest, duration))
+        self.db.executemany(
+            "INSERT INTO result_summary (run_id, host, outcome, reason, count, total_duration, max_duration) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (run_id, host, outcome, reason) DO UPDATE SET "
+            "count = count + excluded.count, "
+            "total_duration = total_duration + excluded.total_duration, "
+            "max_duration = MAX(max_duration, excluded.max_duration)",
+            [key + value for key, value in groups.items()]
+        )
+
+    def summary(self, run_id, top=10):
+        """Aggregate view of a run: totals by outcome, top reasons, and the worst hosts.
+
+        Everything is read from ``result_summary``, so the cost depends on
+        the number of hosts and distinct reasons, not on the number of results.
+        """
+        query = lambda sql, *args: self.db.execute(sql, (run_id,) + args).fetchall()
+        return {
+            "outcomes": dict(query(
+                "SELECT outcome, SUM(count) FROM result_summary WHERE run_id = ? GROUP BY outcome"
+            )),
+            "reasons": query(
+                "SELECT outcome, reason, SUM(count) AS n FROM result_summary WHERE run_id = ? "
+                "AND outcome != 'success' GROUP BY outcome, reason ORDER BY n DESC LIMIT ?", top
+            ),
+            "failing_hosts": query(
+                "SELECT host, SUM(CASE WHEN outcome = 'failed' THEN count ELSE 0 END) AS failed, SUM(count) "
+                "FROM result_summary WHERE run_id = ? GROUP BY host HAVING failed > 0 "
+                "ORDER BY failed DESC, host LIMIT ?", top
+            ),
+            "slowest_hosts": query(
+                "SELECT host, SUM(total_duration) / SUM(count) AS mean, MAX(max_duration), SUM(count) "
+                "FROM result_summary WHERE run_id = ? GROUP BY host ORDER BY mean DESC LIMIT ?", top
+            )
+        }
+
+    def results_page(self, run_id, outcome=None, host=None, reason=None, limit=20, offset=0):
+        """Return up to ``limit`` results of a run after skipping ``offset``, in the order they finished.
+
+        ``outcome`` and ``host`` must match exactly; ``reason`` is a
+        case-insensitive substring.
+        """
+        sql = "SELECT url, submitted, retries, reason, forms, duration, outcome FROM results WHERE run_id = ?"
+        args = [run_id]
+        if outcome:
+            sql += " AND outcome = ?"
+            args.append(outcome)
+        if host:
+            sql += " AND host = ?"
+            args.append(host.lower())
+        if reason:
+            sql += " AND reason LIKE ?"
+            args.append(f"%{reason}%")
+        sql += " ORDER BY rowid LIMIT ? OFFSET ?"
+        args += [limit, offset]
+        return [{"url": url, "submitted": bool(submitted), "retries": retries, "reason": reason,
+                 "forms": forms, "duration": duration, "outcome": outcome}
+                for url, submitted, retries, reason, forms, duration, outcome in self.db.execute(sql, args)]
+
+    def entered_since(self, since):
+        """Return the set of URLs successfully entered at or after ``since``."""
+        rows = self.db.execute("SELECT url FROM entries WHERE last_entered >= ?", (since,))
+        return {url for (url,) in rows}
+
+    def latest_run(self):
+        """Return ``(run_id, duration)`` of the most recent run, or None."""
+        return self.db.execute("SELECT id, duration FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+
+    def get_run(self, run_id):
+        """Return ``(run_id, duration)`` of run ``run_id``, or None if there is no such run."""
+        return self.db.execute("SELECT id, duration FROM runs WHERE id = ?", (run_id,)).fetchone()
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+# ========== Run Journal ==========
+class RunJournal:
+    """Append-only NDJSON checkpoint of an automation run.
+
+    The journal records the run's ledger id, every contest URL queued for
+    submission, every completed result and whether discovery finished.
+    Records are buffered and flushed in batches; the file is removed once
+    the run completes, so its presence means a run was interrupted.
+    """
+
+    def __init__(self, path=JOURNAL_FILE, batch_size=50, append=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = []
+        self.file = open(path, "a" if append else "w")
+
+    @staticmethod
+    def load(path=JOURNAL_FILE):
+        """Return the state of an interrupted run, or None if there is none."""
+        if not os.path.exists(path):
+            return None
+        state = {"run_id": None, "urls": [], "completed": {}, "discovered": False}
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn final line from a crash mid-write
+                if entry["type"] == "start":
+                    state["run_id"] = entry["run_id"]
+                elif entry["type"] == "url":
+                    state["urls"].append(entry["url"])
+                elif entry["type"] == "result":
+                    state["completed"][entry["result"]["url"]] = entry["result"]
+                elif entry["type"] == "discovered":
+                    state["discovered"] = True
+        return state if state["run_id"] is not None else None
+
+    def _write(self, entry):
+        self.buffer.append(json.dumps(entry) + "\n")
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def start(self, run_id):
+        self._write({"type": "start", "run_id": run_id})
+        self.flush()
+
+    def add_url(self, url):
+        self._write({"type": "url", "url": url})
+
+    def add_result(self, result):
+        self._write({"type": "result", "result": result})
+
+    def mark_discovered(self):
+        self._write({"type": "discovered"})
+        self.flush()
+
+    def flush(self):
+        if self.file.closed or not self.buffer:
+            return
+        self.file.writelines(self.buffer)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.buffer = []
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def complete(self):
+        """Close the journal and delete it; the run no longer needs resuming."""
+        self.buffer = []
+        self.file.close()
+        os.remove(self.path)
 
 # ========== UI ==========
 def display_banner():
@@ -383,105 +2279,425 @@ def display_banner():
         subtitle="Automation Ready"
     ))
 
-def display_results(results, start_time, result_file):
-    table = Table(show_lines=True, header_style="bold magenta", border_style="cyan")
-    table.add_column("Site", style="cyan", overflow="fold")
-    table.add_column("Result", justify="center", style="bold")
-    table.add_column("Notes", justify="left", style="white")
-
-    for r in results:
-        url = f"[cyan]{r['url']}[/]"
-        if r["submitted"]:
-            result = "[green]Success[/]"
-            notes = f"{r.get('forms', 1)} form(s) attempted"
-        elif "CAPTCHA" in r["reason"]:
-            result = "[yellow]Skipped (CAPTCHA)[/]"
-            notes = "CAPTCHA detected"
-        elif "No forms" in r["reason"]:
-            result = "[yellow]Skipped (no forms)[/]"
-            notes = "No form elements found"
-        else:
-            result = "[red]Failed[/]"
-            notes = r["reason"]
-        table.add_row(url, result, notes)
+OUTCOME_LABELS = {
+    "success": "[green]Success[/]",
+    "captcha": "[yellow]Skipped (CAPTCHA)[/]",
+    "no_form": "[yellow]Skipped (no forms)[/]",
+    "failed": "[red]Failed[/]"
+}
+
+def result_notes(r):
+    if r["outcome"] == "success":
+        return f"{r.get('forms', 1)} form(s) attempted"
+    if r["outcome"] == "captcha":
+        return "CAPTCHA detected"
+    if r["outcome"] == "no_form":
+        return "No form elements found"
+    return r["reason"]
 
+def display_results(ledger, run_id, duration, page=1, page_size=20, outcome=None, host=None, reason=None,
+                    top=10):
+    """Summarise run ``run_id`` and show one page of its results.
+
+    The summary comes from the ledger's per-host aggregates and only
+    ``page_size`` result rows are read, so this stays quick however many
+    URLs the run had. Returns True when there are more matching rows.
+    """
+    summary = ledger.summary(run_id, top)
+    total = sum(summary["outcomes"].values())
+    success = summary["outcomes"].get("success", 0)
     console.print(Panel.fit("[bold cyan]📊 Contest Automation Summary[/]", border_style="cyan"))
-    console.print(table)
 
-    total = len(results)
-    success = sum(r["submitted"] for r in results)
-    duration = (datetime.now() - start_time).total_seconds()
+    outcomes = Table(title="Outcomes", header_style="bold magenta", border_style="cyan")
+    outcomes.add_column("Result")
+    outcomes.add_column("URLs", justify="right")
+    outcomes.add_column("Share", justify="right")
+    for name in OUTCOMES:
+        count = summary["outcomes"].get(name, 0)
+        if count:
+            outcomes.add_row(OUTCOME_LABELS[name], str(count), f"{count / total:.0%}")
+    console.print(outcomes)
+
+    if summary["reasons"]:
+        reasons = Table(title=f"Top {top} Reasons", header_style="bold magenta", border_style="cyan")
+        reasons.add_column("Result")
+        reasons.add_column("Reason", overflow="fold")
+        reasons.add_column("URLs", justify="right")
+        for name, text, count in summary["reasons"]:
+            reasons.add_row(OUTCOME_LABELS[name], text, str(count))
+        console.print(reasons)
+
+    if summary["failing_hosts"]:
+        failing = Table(title="Most Failing Hosts", header_style="bold magenta", border_style="cyan")
+        failing.add_column("Host", style="cyan", overflow="fold")
+        failing.add_column("Failed", justify="right")
+        failing.add_column("URLs", justify="right")
+        failing.add_column("Failure Rate", justify="right")
+        for name, failed, count in summary["failing_hosts"]:
+            failing.add_row(name, str(failed), str(count), f"{failed / count:.0%}")
+        console.print(failing)
+
+    slowest = Table(title="Slowest Hosts", header_style="bold magenta", border_style="cyan")
+    slowest.add_column("Host", style="cyan", overflow="fold")
+    slowest.add_column("Mean", justify="right")
+    slowest.add_column("Max", justify="right")
+    slowest.add_column("URLs", justify="right")
+    for name, mean, longest, count in summary["slowest_hosts"]:
+        slowest.add_row(name, f"{mean:.2f}s", f"{longest:.2f}s", str(count))
+    if summary["slowest_hosts"]:
+        console.print(slowest)
+
+    rows = ledger.results_page(run_id, outcome, host, reason, page_size + 1, (page - 1) * page_size)
+    more = len(rows) > page_size
+    filters = [(key, value) for key, value in (("outcome", outcome), ("host", host), ("reason", reason)) if value]
+    if page_size:
+        described = ", ".join(f"{key}={value}" for key, value in filters)
+        table = Table(title=f"Results — page {page}" + (f" ({described})" if described else ""),
+                      show_lines=True, header_style="bold magenta", border_style="cyan")
+        table.add_column("Site", style="cyan", overflow="fold")
+        table.add_column("Result", justify="center", style="bold")
+        table.add_column("Notes", justify="left", style="white")
+        table.add_column("Time", justify="right")
+        for r in rows[:page_size]:
+            duration_text = f"{r['duration']:.2f}s" if r["duration"] is not None else "-"
+            table.add_row(f"[cyan]{r['url']}[/]", OUTCOME_LABELS[r["outcome"]], result_notes(r), duration_text)
+        if rows:
+            console.print(table)
+        else:
+            console.print("[yellow]No results match on this page.[/]")
 
     console.print(
         Panel.fit(
             f"[bold green]Automation complete — {success}/{total} sites in {duration:.1f}s[/]\n\n"
-            f"[white]Results saved to:[/] [magenta]{result_file}[/]",
+            f"[white]Results saved to:[/] [magenta]{LEDGER_FILE}[/] (run {run_id})"
+            + (f"\n[dim]More results: python AutoContest.py results --run {run_id} --page {page + 1}"
+               + (f" --page-size {page_size}" if page_size != 20 else "")
+               + "".join(f' --{key} "{value}"' for key, value in filters) + "[/]" if more else ""),
             border_style="green"
         )
     )
+    return more
 
 # ========== Main Automation ==========
-async def run_automation_async(update_aggregators=False):
+class RunResources:
+    """Config, HTTP client and caches that outlive a single run.
+
+    A one-off run builds these and throws them away; the daemon keeps one
+    set for its whole life so the connection pool, DNS cache and the
+    redirect/no-form/form-plan/circuit caches stay warm between runs.
+    """
+
+    def __init__(self, config, client):
+        self.config = config
+        self.client = client
+        self.canonicalizer = UrlCanonicalizer(config.get("tracking_params"))
+        self.resolver = RedirectResolver(
+            client,
+            max_age_days=config.get("redirect_cache_days", 30),
+            patterns=config.get("redirect_patterns")
+        ) if config.get("resolve_redirects", True) else None
+        self.no_forms = NoFormCache(
+            max_age_days=config.get("no_form_cache_days", 7),
+            pattern_threshold=config.get("no_form_pattern_threshold", 5)
+        )
+        self.filler = FormFiller(config["field_mappings"])
+        self.breakers = CircuitBreakers(
+            threshold=config.get("breaker_threshold", 5),
+            cooldown_minutes=config.get("breaker_cooldown_minutes", 30)
+        )
+
+    def save(self):
+        if self.resolver:
+            self.resolver.save()
+        self.no_forms.save()
+        self.breakers.save()
+        if self.client.cache:
+            self.client.cache.save()
+
+def load_run_config(overrides=None):
+    """Load ``config.json`` and apply command-line ``overrides`` on top."""
     config = load_config()
-    if update_aggregators:
-        update_aggregator_urls(config)
+    config.update(overrides or {})
+    return config
+
+async def run_automation_async(update_aggregators=False, resume=False, overrides=None, limit=None):
+    config = load_run_config(overrides)
+    state = None
+    if resume:
+        state = RunJournal.load(JOURNAL_FILE)
+        if state is None:
+            console.print("[red]No interrupted run to resume.[/]")
+            return
+    async with HttpClient(config) as client:
+        await run_pipeline(RunResources(config, client), state, update_aggregators, limit)
+
+async def run_pipeline(resources, state=None, update_aggregators=False, limit=None):
+    """Discover and submit contests once, resuming from the journal ``state`` if given.
+
+    With ``limit``, at most that many contest URLs are queued for submission.
+    """
+    config = resources.config
+    client = resources.client
+    configure_html_backend(config.get("html_parser", "auto"))
+    metrics.reset()
+    if update_aggregators and not state:
+        with metrics.phase("update_aggregators"):
+            await update_aggregator_urls_async(client, config)
     user_data = get_user_data(config)
     start_time = datetime.now()
-    contest_urls = scrape_contest_urls(config["aggregator_urls"])
+    ledger = EntryLedger(LEDGER_FILE, config.get("ledger_batch_size", 100))
+    journal = RunJournal(JOURNAL_FILE, config.get("journal_batch_size", 50), append=state is not None)
+    if state:
+        recorded = ledger.resume_run(state["run_id"])
+        for result in state["completed"].values():
+            if result["url"] not in recorded:
+                ledger.record(result)
+        frontier = state["urls"]
+        # The ledger may have flushed results the journal had not yet written
+        completed = set(state["completed"]) | recorded
+        console.print(f"[cyan]Resuming run: {len(completed & set(frontier))}/{len(frontier)} "
+                      f"queued URLs already done.[/]")
+    else:
+        journal.start(ledger.start_run())
+        frontier = []
+        completed = set()
+    journaled = set(frontier)
+    resolver = resources.resolver
+    no_forms = resources.no_forms
+    window = config.get("reentry_window_hours", 24)
+    recently_entered = ledger.entered_since(time.time() - window * 3600) if window else set()
+    contest_submitter = ContestSubmitter(client, user_data, config, resources.filler, resources.breakers)
+    workers = config.get("workers", 1)
+    if workers > 1:
+        submitter = ShardedSubmitter(config, user_data, workers, config.get("queue_size", 1000))
+    else:
+        submitter = SubmissionScheduler(
+            client,
+            config.get("submit_concurrency", 10),
+            config.get("min_host_interval", 1.0),
+            config.get("queue_size", 1000)
+        )
 
-    results = []
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console
-    ) as progress:
-        task = progress.add_task("[cyan]Submitting forms...", total=len(contest_urls))
-        for url in contest_urls:
-            try:
-                result = await submit_form_async(
-                    url, user_data, {"User-Agent": "Mozilla/5.0"},
-                    config["field_mappings"], config["max_retries"], config["twocaptcha_api_key"]
-                )
-                results.append({
-                    "url": url,
-                    "submitted": result[0],
-                    "retries": result[1],
-                    "reason": result[2],
-                    "forms": 1
-                })
+    try:
+        with make_progress() as progress:
+            task = progress.add_task("[cyan]Submitting forms...", total=0)
+            queued = set()
+            skipped = 0
+            skipped_no_form = 0
+
+            async def enqueue(url):
+                nonlocal skipped, skipped_no_form
+                if url in queued or url in completed:
+                    return
+                if limit and len(queued) >= limit:
+                    return
+                if url in recently_entered:
+                    skipped += 1
+                    return
+                if no_forms.blocks(url):
+                    skipped_no_form += 1
+                    return
+                queued.add(url)
+                metrics.incr("contests_queued")
+                if url not in journaled:
+                    journal.add_url(url)
+                progress.update(task, total=len(queued))
+                await submitter.put(url)
+
+            async def discover():
+                try:
+                    for url in frontier:
+                        await enqueue(url)
+                    if not (state and state["discovered"]):
+                        with metrics.phase("scrape"):
+                            await scrape_contest_urls_async(
+                                client,
+                                config["aggregator_urls"],
+                                config.get("scrape_concurrency", 20),
+                                config.get("per_host_concurrency", 2),
+                                on_url=enqueue,
+                                progress=progress,
+                                canonicalizer=resources.canonicalizer,
+                                resolver=resolver
+                            )
+                        journal.mark_discovered()
+                finally:
+                    await submitter.close()
+
+            def record(result):
+                if result["reason"] in NO_FORM_REASONS:
+                    no_forms.record_miss(result["url"])
+                elif result.get("forms"):
+                    no_forms.record_form(result["url"])
+                ledger.record(result)
+                journal.add_result(result)
+                metrics.incr("entries_submitted" if result["submitted"] else "entries_failed")
                 progress.advance(task)
+
+            async def submit(url, attempt):
+                result, delay = await contest_submitter.attempt(url, attempt)
+                if result is None:
+                    await submitter.retry(url, attempt + 1, delay)
+                else:
+                    record(result)
+
+            if workers > 1:
+                submitting = submitter.run(record)
+            else:
+                submitting = submitter.run(submit)
+            # Submission overlaps discovery, so this phase spans the whole pipeline
+            with metrics.phase("submit"):
+                await asyncio.gather(discover(), submitting)
+        resources.filler.save()
+    finally:
+        resources.save()
+        ledger.flush()
+        journal.close()
+        metrics.export(RUN_REPORT_FILE, METRICS_FILE)
+
+    duration = (datetime.now() - start_time).total_seconds()
+    ledger.finish_run(duration)
+    journal.complete()
+    if skipped:
+        console.print(f"[cyan]Skipped {skipped} URLs already entered in the last {window} hours.[/]")
+    if skipped_no_form:
+        console.print(f"[cyan]Skipped {skipped_no_form} URLs known to have no entry form.[/]")
+    console.print(f"[cyan]Run metrics written to {RUN_REPORT_FILE} and {METRICS_FILE}.[/]")
+    display_results(ledger, ledger.run_id, duration)
+    ledger.close()
+
+def run_automation(update_aggregators=False, resume=False, overrides=None, limit=None):
+    asyncio.run(run_automation_async(update_aggregators, resume, overrides, limit))
+
+async def discover_async(update_aggregators=False, overrides=None, limit=None, output=None):
+    """Scrape the aggregators and write the contest URLs found, without submitting anything."""
+    config = load_run_config(overrides)
+    configure_html_backend(config.get("html_parser", "auto"))
+    if not output:
+        console.file = sys.stderr  # keep stdout to the URLs alone so it can be piped
+    async with HttpClient(config) as client:
+        resources = RunResources(config, client)
+        if update_aggregators:
+            await update_aggregator_urls_async(client, config)
+        found = 0
+        out = open(output, "w") if output else None
+
+        async def emit(url):
+            nonlocal found
+            if limit and found >= limit:
+                return
+            found += 1
+            print(url, file=out or sys.stdout)
+
+        try:
+            await scrape_contest_urls_async(
+                client,
+                config["aggregator_urls"],
+                config.get("scrape_concurrency", 20),
+                config.get("per_host_concurrency", 2),
+                on_url=emit,
+                canonicalizer=resources.canonicalizer,
+                resolver=resources.resolver
+            )
+        finally:
+            if out:
+                out.close()
+            resources.save()
+    if output:
+        console.print(f"[green]Wrote {found} contest URLs to {output}[/]")
+
+def discover(update_aggregators=False, overrides=None, limit=None, output=None):
+    asyncio.run(discover_async(update_aggregators, overrides, limit, output))
+
+async def run_daemon_async(interval_minutes, update_aggregators=False, overrides=None, limit=None):
+    """Run the pipeline every ``interval_minutes`` until stopped, reusing one set of RunResources.
+
+    ``config.json`` is only re-read when it changes on disk; the caches and
+    form mappings are then rebuilt from it around the same client. HTTP
+    client settings (pool limits, timeouts, body cap, response cache) apply
+    from the next daemon start.
+    """
+    config = load_run_config(overrides)
+    config_mtime = os.path.getmtime(CONFIG_FILE) if os.path.exists(CONFIG_FILE) else None
+    loop = asyncio.get_running_loop()
+    try:
+        # systemd stops services with SIGTERM; treat it like Ctrl+C
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, RuntimeError):
+        pass  # no signal handlers on Windows event loops
+    async with HttpClient(config) as client:
+        resources = RunResources(config, client)
+        while True:
+            started = time.monotonic()
+            mtime = os.path.getmtime(CONFIG_FILE) if os.path.exists(CONFIG_FILE) else None
+            if mtime != config_mtime:
+                config.clear()
+                config.update(load_run_config(overrides))
+                config_mtime = mtime
+                resources.save()
+                resources = RunResources(config, client)
+                log_event(logging.INFO, "config_reloaded")
+            # An interrupted run (e.g. from a restart) is finished before a fresh one starts
+            state = RunJournal.load(JOURNAL_FILE)
+            log_event(logging.INFO, "daemon_run_started", resume=state is not None)
+            try:
+                await run_pipeline(resources, state, update_aggregators, limit)
             except Exception as e:
-                results.append({"url": url, "submitted": False, "retries": 0, "reason": f"Error: {str(e)}"})
-                progress.advance(task)
+                log_event(logging.ERROR, "daemon_run_failed", error=describe_error(e))
+                console.print(f"[red]Run failed: {describe_error(e)}[/]")
+            wait = max(0.0, interval_minutes * 60 - (time.monotonic() - started))
+            log_event(logging.INFO, "daemon_sleeping", seconds=round(wait))
+            console.print(f"[cyan]Next run at {datetime.fromtimestamp(time.time() + wait):%H:%M:%S}.[/]")
+            await asyncio.sleep(wait)
 
-    with open(RESULT_FILE, "w") as f:
-        json.dump(results, f, indent=4)
+def run_daemon(interval_minutes, update_aggregators=False, overrides=None, limit=None):
+    try:
+        asyncio.run(run_daemon_async(interval_minutes, update_aggregators, overrides, limit))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        console.print("[yellow]Daemon stopped.[/]")
 
-    display_results(results, start_time, RESULT_FILE)
+def view_last_results(run_id=None, page=1, interactive=False, **view):
+    """Show a run from the ledger (the latest by default); ``view`` holds display_results filters.
 
-def run_automation(update_aggregators=False):
-    asyncio.run(run_automation_async(update_aggregators))
+    With ``interactive``, the user can page back and forth through the results.
+    """
+    run = None
+    if os.path.exists(LEDGER_FILE):
+        ledger = EntryLedger(LEDGER_FILE)
+        run = ledger.get_run(run_id) if run_id else ledger.latest_run()
+        if run:
+            run_id, duration = run
+            while True:
+                more = display_results(ledger, run_id, duration or 0.0, page, **view)
+                if not interactive:
+                    break
+                from rich.prompt import Prompt
+                choices = (["n"] if more else []) + (["p"] if page > 1 else []) + ["q"]
+                choice = Prompt.ask("[n]ext page, [p]revious page or [q]uit", choices=choices, default="q")
+                if choice == "q":
+                    break
+                page += 1 if choice == "n" else -1
+        ledger.close()
+    if not run:
+        console.print("[red]No results found. Run automation first.[/]" if not run_id
+                      else f"[red]No run with id {run_id}.[/]")
 
 # ========== Menu ==========
 def menu():
+    from rich.prompt import Prompt
     display_banner()
     config = load_config()
     while True:
         console.print(Panel.fit(
-            "[1] Run Automation\n[2] View Last Results\n[3] Enter User Details\n[4] Update Aggregator URLs\n[5] Exit",
+            "[1] Run Automation\n[2] View Last Results\n[3] Enter User Details\n[4] Update Aggregator URLs\n"
+            "[5] Resume Interrupted Run\n[6] Exit",
             title="[bold cyan]Main Menu[/]", border_style="cyan"
         ))
-        choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5"])
+        choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5", "6"])
         if choice == "1":
             run_automation(update_aggregators=True)
         elif choice == "2":
-            if os.path.exists(RESULT_FILE):
-                with open(RESULT_FILE, "r") as f:
-                    results = json.load(f)
-                display_results(results, datetime.now(), RESULT_FILE)
-            else:
-                console.print("[red]No results found. Run automation first.[/]")
+            view_last_results(interactive=True)
         elif choice == "3":
             config["user_data"] = input_user_data()
             save_config(config)
@@ -489,9 +2705,88 @@ def menu():
         elif choice == "4":
             update_aggregator_urls(config)
         elif choice == "5":
+            run_automation(resume=True)
+        elif choice == "6":
             console.print("[yellow]Exiting AutoContest...[/]")
             break
 
-if __name__ == "__main__":
+# ========== Command Line ==========
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="autocontest",
+        description="Automated sweepstakes & contest entry tool. Starts the interactive menu "
+                    "when no command is given."
+    )
+    parser.add_argument("--resume", action="store_true", help="same as 'run --resume'")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    def add_tuning(command):
+        command.add_argument("--update-aggregators", action="store_true",
+                             help="look for new aggregator sites before scraping")
+        command.add_argument("--scrape-concurrency", type=int, metavar="N",
+                             help="pages fetched at once while scraping")
+        command.add_argument("--limit", type=int, metavar="N", help="stop after N contest URLs")
+
+    def add_submit_tuning(command):
+        add_tuning(command)
+        command.add_argument("--concurrency", type=int, metavar="N", help="form submissions in flight at once")
+        command.add_argument("--workers", type=int, metavar="N", help="submission worker processes")
+        command.add_argument("--min-host-interval", type=float, metavar="SECONDS",
+                             help="minimum gap between requests to the same site")
+
+    run = commands.add_parser("run", help="discover contests and submit entries once")
+    add_submit_tuning(run)
+    run.add_argument("--resume", action="store_true", help="continue the last interrupted run")
+
+    discover_cmd = commands.add_parser("discover", help="list contest URLs without submitting anything")
+    add_tuning(discover_cmd)
+    discover_cmd.add_argument("-o", "--output", metavar="FILE", help="write the URLs to FILE instead of the screen")
+
+    results = commands.add_parser("results", help="show the results of a run from the ledger")
+    results.add_argument("--run", type=int, metavar="ID", dest="run_id", help="run to show (default: the latest)")
+    results.add_argument("--page", type=int, default=1, help="page of result rows to show (default: 1)")
+    results.add_argument("--page-size", type=int, default=20, metavar="N",
+                         help="result rows per page, 0 for the summary only (default: 20)")
+    results.add_argument("--outcome", choices=OUTCOMES, help="only show results with this outcome")
+    results.add_argument("--host", help="only show results from this host")
+    results.add_argument("--reason", help="only show results whose reason contains this text")
+    results.add_argument("--top", type=int, default=10, metavar="N",
+                         help="reasons and hosts listed in the summary (default: 10)")
+
+    daemon = commands.add_parser("daemon", help="run on a schedule, keeping connections and caches warm")
+    add_submit_tuning(daemon)
+    daemon.add_argument("--interval", type=float, metavar="MINUTES",
+                        help="minutes between run starts (default: daemon_interval_minutes in config.json)")
+    return parser
+
+def config_overrides(args):
+    """Map tuning flags that were given onto their ``config.json`` keys."""
+    flags = {
+        "scrape_concurrency": "scrape_concurrency",
+        "concurrency": "submit_concurrency",
+        "workers": "workers",
+        "min_host_interval": "min_host_interval"
+    }
+    return {key: getattr(args, flag) for flag, key in flags.items() if getattr(args, flag, None) is not None}
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
     init_logging()
-    menu()
+    if args.command is None:
+        if args.resume:
+            run_automation(resume=True)
+        else:
+            menu()
+    elif args.command == "run":
+        run_automation(args.update_aggregators, args.resume, config_overrides(args), args.limit)
+    elif args.command == "discover":
+        discover(args.update_aggregators, config_overrides(args), args.limit, args.output)
+    elif args.command == "results":
+        view_last_results(args.run_id, max(1, args.page), page_size=max(0, args.page_size),
+                          outcome=args.outcome, host=args.host, reason=args.reason, top=args.top)
+    elif args.command == "daemon":
+        interval = args.interval or load_config().get("daemon_interval_minutes", 360)
+        run_daemon(interval, args.update_aggregators, config_overrides(args), args.limit)
+
+if __name__ == "__main__":
+    main()
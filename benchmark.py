@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+AutoContest benchmark
+
+Runs the real pipeline (discovery, scraping and submission) against a synthetic
+web farm served from localhost, so throughput can be measured (and
+regressions caught) without touching the public internet.
+
+    python benchmark.py --urls 5000
+    python benchmark.py --urls 50000 --json run.json
+    python benchmark.py --urls 5000 --baseline run.json
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import asyncio
+import argparse
+import resource
+import tempfile
+import multiprocessing
+from aiohttp import web
+from rich.console import Console
+from rich.table import Table
+
+import AutoContest as ac
+
+# ========== Init ==========
+console = Console()
+
+FARM_DOMAIN = "bench.test"
+FORM_FIELDS = ["first_name", "last_name", "email", "phone", "address", "city", "state", "zip"]
+FILLER_TEXT = "<p>Enter daily for your chance to win. No purchase necessary. Void where prohibited.</p>\n"
+
+# ========== Farm ==========
+# The farm is a single aiohttp server that routes on the Host header, and the
+# client pins every *.bench.test name to it, so each synthetic site gets its
+# own connection pool just like a real host would.
+#
+#   hub.bench.test/hub/<k>                 lists aggregator pages and a few non-aggregators
+#   hub.bench.test/about/<k>               a page with a single contest link
+#   agg<n>.bench.test/sweepstakes/page/<p> lists contest links, some via /sweepstakes/go/<i>
+#   c<n>.bench.test/giveaway/<i>           a contest: form, no form, 404, slow or 429
+#   c<n>.bench.test/enter/<i>              accepts the entry (GET or POST)
+
+def build_spec(args):
+    pages = max(1, math.ceil(args.urls / args.links_per_page))
+    return {
+        "urls": args.urls,
+        "links_per_page": args.links_per_page,
+        "pages": pages,
+        "agg_hosts": min(args.agg_hosts, pages),
+        "contest_hosts": max(1, math.ceil(args.urls / args.urls_per_host)),
+        "hubs": min(args.hubs, pages),
+        "dead": args.dead,
+        "slow": args.slow,
+        "slow_ms": args.slow_ms,
+        "throttle": args.throttle,
+        "no_form": args.no_form,
+        "redirects": args.redirects
+    }
+
+def contest_kind(i, spec):
+    """Deterministic behaviour of contest ``i``, spread evenly over the farm."""
+    roll = (i * 2654435761) % 10000 / 100  # 0-99.99, well mixed across consecutive ids
+    for kind in ("dead", "slow", "throttle", "no_form"):
+        if roll < spec[kind]:
+            return kind
+        roll -= spec[kind]
+    return "form"
+
+def contest_host(i, spec):
+    return f"c{i % spec['contest_hosts']}.{FARM_DOMAIN}"
+
+def page_html(title, body):
+    return f"<!DOCTYPE html>\n<html><head><title>{title}</title></head><body>\n{body}</body></html>\n"
+
+def contest_page(i, with_form):
+    # Pages range from a few KB to ~200KB of text ahead of the form
+    padding = FILLER_TEXT * (40 * (i % 8) + (2000 if i % 97 == 0 else 0))
+    if not with_form:
+        return page_html(f"Giveaway {i}", padding + "<p>This giveaway has ended.</p>\n")
+    method = "post" if i % 2 else "get"
+    fields = [f'<label>{name}</label><input type="text" name="{name}">'
+              for name in FORM_FIELDS[:3 + i % len(FORM_FIELDS)]]
+    fields += [f'<input type="hidden" name="token_{k}" value="{i}-{k}">' for k in range(i % 5)]
+    if i % 3 == 0:
+        fields.append('<select name="country"><option value="US">US</option><option value="CA">CA</option></select>')
+    form = (f'<form action="/enter/{i}" method="{method}">\n' + "\n".join(fields)
+            + '\n<input type="submit" value="Enter"></form>\n')
+    return page_html(f"Giveaway {i}", padding + form + FILLER_TEXT * 5)
+
+def make_farm(spec):
+    throttled = set()
+
+    async def handle(request):
+        host = request.host.split(":")[0]
+        parts = request.path.strip("/").split("/")
+        name = host[:-len(FARM_DOMAIN) - 1]
+
+        if name == "hub" and parts[0] == "hub":
+            k = int(parts[1])
+            links = [f'<a href="http://agg{p % spec["agg_hosts"]}.{FARM_DOMAIN}:{request.url.port}'
+                     f'/sweepstakes/page/{p}">Directory {p}</a>'
+                     for p in range(k, spec["pages"], spec["hubs"])]
+            links += [f'<a href="/about/{k * 10 + j}">About {j}</a>' for j in range(5)]
+            return web.Response(text=page_html("Hub", "\n".join(links)), content_type="text/html")
+        if name == "hub" and parts[0] == "about":
+            return web.Response(text=page_html("About", '<a href="/sweepstakes">Our sweepstakes</a>'),
+                                content_type="text/html")
+
+        if name.startswith("agg") and parts[:2] == ["sweepstakes", "page"]:
+            p = int(parts[2])
+            first = p * spec["links_per_page"]
+            links = []
+            for i in range(first, min(first + spec["links_per_page"], spec["urls"])):
+                if i % 100 < spec["redirects"]:
+                    links.append(f'<li><a href="/sweepstakes/go/{i}">Giveaway {i}</a></li>')
+                else:
+                    links.append(f'<li><a href="http://{contest_host(i, spec)}:{request.url.port}'
+                                 f'/giveaway/{i}?utm_source=agg{p}">Giveaway {i}</a></li>')
+            nav = '<a href="/">Home</a> <a href="/about">About</a> <a href="/privacy">Privacy</a>'
+            return web.Response(text=page_html(f"Page {p}", nav + "<ul>\n" + "\n".join(links) + "</ul>\n"),
+                                content_type="text/html")
+        if name.startswith("agg") and parts[:2] == ["sweepstakes", "go"]:
+            i = int(parts[2])
+            raise web.HTTPFound(f"http://{contest_host(i, spec)}:{request.url.port}/giveaway/{i}")
+
+        if name.startswith("c") and parts[0] == "giveaway":
+            i = int(parts[1])
+            kind = contest_kind(i, spec)
+            if kind == "dead":
+                raise web.HTTPNotFound()
+            if kind == "throttle" and i not in throttled:
+                throttled.add(i)
+                raise web.HTTPTooManyRequests(headers={"Retry-After": "1"})
+            if kind == "slow":
+                await asyncio.sleep(spec["slow_ms"] / 1000)
+            return web.Response(text=contest_page(i, kind != "no_form"), content_type="text/html")
+        if name.startswith("c") and parts[0] == "enter":
+            await request.read()
+            return web.Response(text=page_html("Entered", "<h1>Thank you for entering!</h1>"),
+                                content_type="text/html")
+        raise web.HTTPNotFound()
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+def run_farm(spec, ready):
+    """Farm process entry point: serve until terminated, reporting the port on ``ready``."""
+    async def serve():
+        runner = web.AppRunner(make_farm(spec), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=4096)
+        await site.start()
+        ready.put(runner.addresses[0][1])
+        await asyncio.Event().wait()
+    asyncio.run(serve())
+
+def start_farm(spec):
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    process = context.Process(target=run_farm, args=(spec, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=30)
+
+# ========== Measurement ==========
+def percentile(samples, q):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+class RequestTimer:
+    """Wraps a request context manager to keep the exact latency of each request."""
+
+    def __init__(self, request, host, samples):
+        self.request = request
+        self.host = host
+        self.samples = samples
+
+    async def __aenter__(self):
+        self.started = time.perf_counter()
+        return await self.request.__aenter__()
+
+    async def __aexit__(self, *exc_info):
+        try:
+            return await self.request.__aexit__(*exc_info)
+        finally:
+            self.samples.append((self.host, time.perf_counter() - self.started))
+
+def sample_requests(client, samples):
+    for name in ("get", "post"):
+        request = getattr(client, name)
+        setattr(client, name, lambda url, _request=request, **kwargs:
+                RequestTimer(_request(url, **kwargs), ac.host_of(url), samples))
+
+def cpu_seconds():
+    # Shard processes are counted once they have exited and been reaped
+    return sum(usage.ru_utime + usage.ru_stime
+               for usage in map(resource.getrusage, (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)))
+
+# ========== Stages ==========
+# Stages are the pipeline's own phases, timed by ac.metrics; requests are
+# assigned to a stage by the farm host they went to.
+PHASES = {"discover": "update_aggregators", "scrape": "scrape", "submit": "submit"}
+
+def farm_stage(host):
+    name = host.split(".", 1)[0]
+    return "discover" if name == "hub" else "scrape" if name.startswith("agg") else "submit"
+
+def stage_latency(samples, stage):
+    """``(p50, p99)`` in ms of the requests sent for ``stage``.
+
+    Requests sent by this process are timed exactly. With ``workers`` above 1
+    submissions run in shard processes, so their latency histograms (merged
+    into ac.metrics) are used instead, at bucket resolution.
+    """
+    timed = [seconds for host, seconds in samples if farm_stage(host) == stage]
+    if timed:
+        return tuple(round(percentile(timed, q) * 1000, 1) for q in (0.5, 0.99))
+    merged = ac.new_histogram()
+    for host, stages in ac.metrics.latency.items():
+        if farm_stage(host) == stage and "total" in stages:
+            ac.merge_histogram(merged, stages["total"])
+    if not merged["count"]:
+        return None, None
+    return tuple(round(ac.histogram_quantile(merged, q) * 1000, 1) for q in (0.5, 0.99))
+
+async def run_benchmark(config, spec, port, discover):
+    """Run the real pipeline once against the farm and report each of its stages."""
+    config["hub_sites"] = [f"http://hub.{FARM_DOMAIN}:{port}/hub/{k}" for k in range(spec["hubs"])]
+    if not discover:
+        config["aggregator_urls"] = [f"http://agg{p % spec['agg_hosts']}.{FARM_DOMAIN}:{port}/sweepstakes/page/{p}"
+                                     for p in range(spec["pages"])]
+    samples = []
+    cpu = cpu_seconds()
+    started = time.perf_counter()
+    async with ac.HttpClient(config) as client:
+        sample_requests(client, samples)
+        await ac.run_pipeline(ac.RunResources(config, client), None, update_aggregators=discover)
+    elapsed = time.perf_counter() - started
+    cpu = cpu_seconds() - cpu
+
+    counters = ac.metrics.counters
+    items = {
+        "discover": spec["pages"] + spec["hubs"] * 6,
+        "scrape": counters["contests_queued"],
+        "submit": counters["entries_submitted"] + counters["entries_failed"]
+    }
+    report = []
+    for stage, phase in PHASES.items():
+        if phase not in ac.metrics.phases:
+            continue
+        seconds = ac.metrics.phases[phase]
+        p50, p99 = stage_latency(samples, stage)
+        report.append({
+            "stage": stage,
+            "items": items[stage],
+            "seconds": round(seconds, 3),
+            "urls_per_sec": round(items[stage] / seconds, 1) if seconds else None,
+            "p50_ms": p50,
+            "p99_ms": p99,
+            "cpu_seconds": None,
+            "peak_rss_mb": None
+        })
+    report[-1]["submitted"] = counters["entries_submitted"]
+    report.append({
+        "stage": "total",
+        "items": items["submit"],
+        "seconds": round(elapsed, 3),
+        "urls_per_sec": round(items["submit"] / elapsed, 1) if elapsed else None,
+        "p50_ms": None,
+        "p99_ms": None,
+        "cpu_seconds": round(cpu, 3),
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    })
+    return report
+
+# ========== Report ==========
+COLUMNS = [("items", "URLs"), ("seconds", "Seconds"), ("urls_per_sec", "URLs/sec"), ("p50_ms", "p50 ms"),
+           ("p99_ms", "p99 ms"), ("cpu_seconds", "CPU s"), ("peak_rss_mb", "Peak RSS MB")]
+
+def display_report(report, regressions):
+    table = Table(title="Benchmark Results", show_lines=True)
+    table.add_column("Stage", style="cyan")
+    for _, title in COLUMNS:
+        table.add_column(title, justify="right")
+    for row in report:
+        flag = " [red](regressed)[/]" if row["stage"] in regressions else ""
+        table.add_row(row["stage"] + flag, *("-" if row[key] is None else str(row[key]) for key, _ in COLUMNS))
+    console.print(table)
+
+def compare(report, baseline, tolerance):
+    """Stages whose throughput fell, or CPU time per URL rose, by more than ``tolerance``."""
+    previous = {row["stage"]: row for row in baseline["stages"]}
+    regressions = {}
+    for row in report:
+        old = previous.get(row["stage"])
+        if not old or not row["items"] or not old["items"]:
+            continue
+        problems = []
+        if old["urls_per_sec"] and row["urls_per_sec"] < old["urls_per_sec"] * (1 - tolerance):
+            problems.append(f"URLs/sec {old['urls_per_sec']} -> {row['urls_per_sec']}")
+        if old["cpu_seconds"] and row["cpu_seconds"] is not None:
+            old_cpu, new_cpu = old["cpu_seconds"] / old["items"], row["cpu_seconds"] / row["items"]
+            if new_cpu > old_cpu * (1 + tolerance):
+                problems.append(f"CPU ms/URL {old_cpu * 1000:.2f} -> {new_cpu * 1000:.2f}")
+        if problems:
+            regressions[row["stage"]] = problems
+    return regressions
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark AutoContest against a local synthetic web farm.")
+    parser.add_argument("--urls", type=int, default=1000, help="contest URLs in the farm (default: 1000)")
+    parser.add_argument("--links-per-page", type=int, default=500, help="contest links per aggregator page")
+    parser.add_argument("--agg-hosts", type=int, default=10, help="aggregator host names")
+    parser.add_argument("--urls-per-host", type=int, default=20, help="contest URLs per contest host")
+    parser.add_argument("--hubs", type=int, default=4, help="hub pages listing the aggregators")
+    parser.add_argument("--dead", type=float, default=5, help="percent of contests answering 404")
+    parser.add_argument("--slow", type=float, default=5, help="percent of contests answering slowly")
+    parser.add_argument("--slow-ms", type=int, default=200, help="delay of a slow contest page")
+    parser.add_argument("--throttle", type=float, default=2, help="percent of contests answering 429 once")
+    parser.add_argument("--no-form", type=float, default=10, help="percent of contest pages without a form")
+    parser.add_argument("--redirects", type=int, default=2, help="percent of links behind an aggregator redirect")
+    parser.add_argument("--no-discover", action="store_true",
+                        help="start from the farm's aggregator pages instead of discovering them from its hubs")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=JSON",
+                        help="override a config key, e.g. --set submit_concurrency=50")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="fractional slowdown against the baseline that counts as a regression")
+    parser.add_argument("--verbose", action="store_true", help="show the tool's own progress output")
+    return parser.parse_args(argv)
+
+def build_config(args):
+    config = ac.load_config()
+    config.update({
+        "aggregator_urls": [],
+        "host_overrides": {f"*.{FARM_DOMAIN}": "127.0.0.1"},
+        "http_cache": False,
+        "min_host_interval": 0,
+        "submit_concurrency": 50,
+        "max_connections": 200
+    })
+    for item in args.set:
+        key, _, value = item.partition("=")
+        try:
+            config[key] = json.loads(value)
+        except ValueError:
+            config[key] = value
+    return config
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.verbose:
+        ac.console.quiet = True
+    spec = build_spec(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    console.print(f"[cyan]Starting farm: {spec['urls']} contests on {spec['contest_hosts']} hosts, "
+                  f"{spec['pages']} aggregator pages on {spec['agg_hosts']} hosts.[/]")
+    farm, port = start_farm(spec)
+    cwd = os.getcwd()
+    try:
+        # Caches, the ledger and config writes land in a scratch directory
+        with tempfile.TemporaryDirectory(prefix="autocontest-bench-") as scratch:
+            os.chdir(scratch)
+            try:
+                ac.init_logging()
+                config = build_config(args)
+                report = asyncio.run(run_benchmark(config, spec, port, not args.no_discover))
+            finally:
+                os.chdir(cwd)
+    finally:
+        farm.terminate()
+        farm.join()
+
+    regressions = compare(report, baseline, args.tolerance) if baseline else {}
+    display_report(report, regressions)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"spec": spec, "stages": report}, f, indent=4)
+        console.print(f"[green]Results saved to {args.json}[/]")
+    for stage, problems in regressions.items():
+        console.print(f"[red]Regression in {stage}: {'; '.join(problems)}[/]")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())